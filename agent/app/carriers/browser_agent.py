@@ -11,11 +11,49 @@ This approach is:
 - Debuggable (can watch the browser fill forms)
 """
 
+import json
 import os
+from functools import lru_cache
 from typing import Optional, Callable, Any
 
 from browser_use import Agent, Browser, ChatAnthropic
 
+# Task prompt skeleton, filled in by _render_task_prompt()
+_TASK_PROMPT_TEMPLATE = """
+You are filling out a {carrier} commercial auto insurance quote wizard.
+
+QUOTE DATA TO FILL:
+- Company Name: {company}
+- DOT Number: {dot_number}
+- MC Number: {mc_number}
+- Owner/Contact: {owner_name}
+- Address: {address}
+- City: {city}
+- State: {state}
+- ZIP: {zip_code}
+- Phone: {phone}
+- Email: {email}
+- Effective Date: {effective_date}
+{vehicle_info}
+{driver_info}
+
+INSTRUCTIONS:
+1. Navigate through ALL wizard tabs (START, VEHICLES, DRIVERS, BUSINESS, COVERAGES, etc.)
+2. Fill each field you can find with the data above
+3. For fields without data, use reasonable defaults or skip if optional
+4. Click "Next", "Continue", or similar buttons to advance between tabs
+5. For business type, search for "Trucking" or "Motor Carrier"
+6. For vehicles, if specific data not available, use sensible trucking defaults
+
+CRITICAL - STOP CONDITION:
+When you reach the RATES page (shows premium amounts, coverage options):
+- DO NOT click "Finish", "Buy", "Purchase", "Bind", or "Submit"
+- DO NOT proceed past the rates display
+- STOP and report that you've reached the RATES page
+
+Report when done: "RATES page reached - ready for review"
+"""
+
 
 async def fill_quote_form(
     carrier: str,
@@ -94,73 +132,54 @@ def _build_task_prompt(carrier: str, quote_data: dict) -> str:
     1. What data to fill
     2. How to navigate the wizard
     3. When to STOP (RATES page)
+
+    Retries of the same quote reuse the rendered prompt; quote_data is
+    keyed by its canonical JSON since dicts aren't hashable.
     """
-    # Extract quote data with defaults
-    company = quote_data.get("companyName", "")
-    dot_number = quote_data.get("dotNumber", "")
-    mc_number = quote_data.get("mcNumber", "")
-    owner_name = quote_data.get("ownerName", "")
-    address = quote_data.get("address", "")
-    city = quote_data.get("city", "")
-    state = quote_data.get("state", "")
-    zip_code = quote_data.get("zip", "")
-    phone = quote_data.get("phone", "")
-    email = quote_data.get("email", "")
-    effective_date = quote_data.get("effectiveDate", "")
+    return _render_task_prompt(carrier, json.dumps(quote_data, sort_keys=True, default=str))
+
+
+@lru_cache(maxsize=128)
+def _render_task_prompt(carrier: str, quote_json: str) -> str:
+    """Fill _TASK_PROMPT_TEMPLATE from a quote's canonical JSON."""
+    quote_data = json.loads(quote_json)
 
     # Vehicle info if available
     vehicles = quote_data.get("vehicles", [])
     vehicle_info = ""
     if vehicles:
-        vehicle_info = "\nVehicles:\n"
-        for i, v in enumerate(vehicles, 1):
-            vehicle_info += f"  Vehicle {i}: {v.get('year', '')} {v.get('make', '')} {v.get('model', '')}\n"
-            vehicle_info += f"    VIN: {v.get('vin', 'N/A')}\n"
+        vehicle_info = "\nVehicles:\n" + "".join(
+            f"  Vehicle {i}: {v.get('year', '')} {v.get('make', '')} {v.get('model', '')}\n"
+            f"    VIN: {v.get('vin', 'N/A')}\n"
+            for i, v in enumerate(vehicles, 1)
+        )
 
     # Driver info if available
     drivers = quote_data.get("drivers", [])
     driver_info = ""
     if drivers:
-        driver_info = "\nDrivers:\n"
-        for i, d in enumerate(drivers, 1):
-            driver_info += f"  Driver {i}: {d.get('name', '')}\n"
-            driver_info += f"    DOB: {d.get('dob', 'N/A')}, License: {d.get('license', 'N/A')}\n"
-
-    prompt = f"""
-You are filling out a {carrier} commercial auto insurance quote wizard.
-
-QUOTE DATA TO FILL:
-- Company Name: {company}
-- DOT Number: {dot_number}
-- MC Number: {mc_number}
-- Owner/Contact: {owner_name}
-- Address: {address}
-- City: {city}
-- State: {state}
-- ZIP: {zip_code}
-- Phone: {phone}
-- Email: {email}
-- Effective Date: {effective_date}
-{vehicle_info}
-{driver_info}
-
-INSTRUCTIONS:
-1. Navigate through ALL wizard tabs (START, VEHICLES, DRIVERS, BUSINESS, COVERAGES, etc.)
-2. Fill each field you can find with the data above
-3. For fields without data, use reasonable defaults or skip if optional
-4. Click "Next", "Continue", or similar buttons to advance between tabs
-5. For business type, search for "Trucking" or "Motor Carrier"
-6. For vehicles, if specific data not available, use sensible trucking defaults
-
-CRITICAL - STOP CONDITION:
-When you reach the RATES page (shows premium amounts, coverage options):
-- DO NOT click "Finish", "Buy", "Purchase", "Bind", or "Submit"
-- DO NOT proceed past the rates display
-- STOP and report that you've reached the RATES page
+        driver_info = "\nDrivers:\n" + "".join(
+            f"  Driver {i}: {d.get('name', '')}\n"
+            f"    DOB: {d.get('dob', 'N/A')}, License: {d.get('license', 'N/A')}\n"
+            for i, d in enumerate(drivers, 1)
+        )
 
-Report when done: "RATES page reached - ready for review"
-"""
-    return prompt
+    return _TASK_PROMPT_TEMPLATE.format_map({
+        "carrier": carrier,
+        "company": quote_data.get("companyName", ""),
+        "dot_number": quote_data.get("dotNumber", ""),
+        "mc_number": quote_data.get("mcNumber", ""),
+        "owner_name": quote_data.get("ownerName", ""),
+        "address": quote_data.get("address", ""),
+        "city": quote_data.get("city", ""),
+        "state": quote_data.get("state", ""),
+        "zip_code": quote_data.get("zip", ""),
+        "phone": quote_data.get("phone", ""),
+        "email": quote_data.get("email", ""),
+        "effective_date": quote_data.get("effectiveDate", ""),
+        "vehicle_info": vehicle_info,
+        "driver_info": driver_info,
+    })
 
 
 async def fill_progressive_quote(
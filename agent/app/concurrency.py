@@ -0,0 +1,57 @@
+"""
+Concurrency helpers for RMS Assistant tools.
+
+Tools are plain synchronous methods: the agent runs them from agent.run(),
+either on a server executor thread or from inside the scenario adapters'
+coroutines. Tools that combine other (blocking) tools use run_parallel(),
+and run_in_background() for speculative work nobody waits on.
+"""
+
+import contextvars
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shared by run_parallel(); threads (and anything they keep thread-local,
+# like the FMCSA cache connection) are reused across calls
+_PARALLEL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-parallel")
+
+# Shared by run_in_background(); kept small so speculative work can't crowd
+# user-facing run_parallel() calls out of _PARALLEL_POOL
+_BACKGROUND_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tool-background")
+
+
+def run_parallel(*calls: Callable[[], T]) -> list[T]:
+    """
+    Run blocking calls concurrently and return their results in call order.
+
+    For workflows that combine independent lookups, so they take as long as
+    the slowest one instead of the sum. Each call runs in a copy of the
+    caller's context, keeping tool spans under the current trace. The
+    calls must not use run_parallel() themselves: they would wait on the
+    pool they are occupying.
+    """
+    futures = [_PARALLEL_POOL.submit(contextvars.copy_context().run, call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def run_in_background(*calls: Callable[[], object]) -> None:
+    """
+    Start blocking calls on a small background pool and return at once.
+
+    For speculative work such as warming a cache: results are discarded and
+    failures only logged. Unlike run_parallel() calls, these may themselves
+    use run_parallel(). They run outside the caller's context, since the
+    caller's trace may have ended by the time they do.
+    """
+    for call in calls:
+        _BACKGROUND_POOL.submit(call).add_done_callback(_log_failure)
+
+
+def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        log.warning("Background call failed", exc_info=future.exception())
@@ -5,6 +5,7 @@ Tools for managing leads, contacts, and notes in Close CRM.
 Uses the real Close API.
 """
 
+import atexit
 import os
 import httpx
 from agno.tools.toolkit import Toolkit
@@ -12,6 +13,16 @@ from typing import Optional
 from datetime import datetime
 
 from app.observability import observe_tool
+from app.tools.results import LookupResult
+
+# One pooled client for the process: calls reuse a kept-alive (HTTP/2)
+# connection to api.close.com instead of a new TCP+TLS handshake each time
+_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    timeout=30.0,
+)
+atexit.register(_CLIENT.close)
 
 
 class CloseCRMTools(Toolkit):
@@ -49,20 +60,19 @@ class CloseCRMTools(Toolkit):
         auth = (self.api_key, "")  # Basic auth: API key as username, empty password
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                if method == "GET":
-                    response = client.get(url, auth=auth, params=params)
-                elif method == "POST":
-                    response = client.post(url, auth=auth, json=json_data)
-                elif method == "PUT":
-                    response = client.put(url, auth=auth, json=json_data)
-                else:
-                    return {"error": f"Unsupported method: {method}"}
-
-                if response.status_code >= 400:
-                    return {"error": f"API error {response.status_code}: {response.text[:500]}"}
-
-                return response.json()
+            if method == "GET":
+                response = _CLIENT.get(url, auth=auth, params=params)
+            elif method == "POST":
+                response = _CLIENT.post(url, auth=auth, json=json_data)
+            elif method == "PUT":
+                response = _CLIENT.put(url, auth=auth, json=json_data)
+            else:
+                return {"error": f"Unsupported method: {method}"}
+
+            if response.status_code >= 400:
+                return {"error": f"API error {response.status_code}: {response.text[:500]}"}
+
+            return response.json()
         except httpx.TimeoutException:
             return {"error": "Request timed out"}
         except Exception as e:
@@ -211,8 +221,16 @@ class CloseCRMTools(Toolkit):
         Returns:
             str: Lead details if found, or "not found" message
         """
+        return self.get_lead_by_dot_raw(dot_number).text
+
+    def get_lead_by_dot_raw(self, dot_number: str) -> LookupResult:
+        """
+        get_lead_by_dot as a LookupResult, for workflows.
+
+        When found, fields holds lead_id, company and status of the first match.
+        """
         if not dot_number:
-            return "Error: DOT number is required"
+            return LookupResult("Error: DOT number is required", status="error")
 
         dot_number = dot_number.strip()
 
@@ -223,7 +241,7 @@ class CloseCRMTools(Toolkit):
         })
 
         if "error" in result:
-            return f"Error searching leads: {result['error']}"
+            return LookupResult(f"Error searching leads: {result['error']}", status="error")
 
         leads = result.get("data", [])
 
@@ -237,7 +255,7 @@ class CloseCRMTools(Toolkit):
                     break
 
         if not matches:
-            return f"No lead found with DOT {dot_number} in Close"
+            return LookupResult(f"No lead found with DOT {dot_number} in Close")
 
         # Return first match with full details
         lead = matches[0]
@@ -268,7 +286,11 @@ class CloseCRMTools(Toolkit):
         if len(matches) > 1:
             output.append(f"\n({len(matches)} leads match this DOT)")
 
-        return "\n".join(output)
+        return LookupResult(
+            "\n".join(output),
+            status="found",
+            fields={"lead_id": lead_id, "company": name, "status": status},
+        )
 
     @observe_tool
     def create_opportunity(
@@ -4,13 +4,22 @@ DOT Lookup Tools
 Tools for looking up carrier information from FMCSA database.
 """
 
+import atexit
+import itertools
 import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
 import httpx
+import orjson
 from agno.tools.toolkit import Toolkit
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 
 from app.observability import observe_tool
+from app.tools.results import LookupResult
 
 
 class CarrierInfo(BaseModel):
@@ -29,6 +38,201 @@ class CarrierInfo(BaseModel):
     out_of_service: bool = False
 
 
+# FMCSA normally answers in well under a second; fail fast on dead endpoints
+_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=1.0)
+
+# Retry policy for transient FMCSA failures
+_MAX_ATTEMPTS = 3
+_RETRY_BUDGET = 10.0  # seconds, across all attempts
+_BACKOFF_INITIAL = 0.2
+_BACKOFF_MAX = 2.0
+_RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout)
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# FMCSA data changes rarely; responses are reused for an hour and kept
+# afterwards as stale fallback for when the circuit is open
+_CACHE_TTL = 3600
+_DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "fmcsa.sqlite3"
+
+# One pooled client for the process, so retries and later lookups reuse a
+# kept-alive connection instead of paying the TCP+TLS handshake again
+_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    timeout=_TIMEOUT,
+)
+atexit.register(_CLIENT.close)
+
+# Output templates; optional lines are passed in pre-rendered (or empty)
+_CARRIER_TEMPLATE = (
+    "DOT Number: {dot_number}\n"
+    "Legal Name: {legal_name}\n"
+    "{dba_line}"
+    "Entity Type: {entity_type}\n"
+    "Operating Status: {op_status}\n"
+    "Physical Address: {address}\n"
+    "{phone_line}"
+    "{mc_line}"
+    "Power Units: {power_units}\n"
+    "Drivers: {drivers}\n"
+    "MCS-150 Date: {mcs150_date}\n"
+    "Out of Service: {oos_status}"
+)
+
+_SAFETY_HEADER_TEMPLATE = (
+    "Safety Information for DOT {dot_number}:\n"
+    "\n"
+    "Safety Rating: {safety_rating}"
+    "{rating_date_line}"
+    "{oos_line}"
+)
+
+# BASIC display name -> normalized FMCSA basicsType
+_BASIC_NAMES = {
+    "Unsafe Driving": "unsafedriving",
+    "Hours-of-Service": "hos",
+    "Driver Fitness": "driverfitness",
+    "Controlled Substances": "controlledsubstance",
+    "Vehicle Maintenance": "vehiclemaintenance",
+    "Hazmat Compliance": "hazmat",
+    "Crash Indicator": "crashindicator",
+}
+
+
+class FMCSAUnavailableError(Exception):
+    """FMCSA circuit is open and there is no cached response to fall back on."""
+
+
+class _CircuitBreaker:
+    """
+    Minimal circuit breaker shared by every FMCSA call in the process.
+
+    After fail_max consecutive failures the circuit opens and calls fail fast
+    for reset_timeout seconds. The first call after that is let through as a
+    trial while the rest keep failing fast; success closes the circuit,
+    failure re-opens it. A trial that never reports back is replaced by a
+    new one after another reset_timeout.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        # When the current half-open trial started, if one is running
+        self._trial_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._failures < self.fail_max:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+                return False
+            self._trial_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+                self._trial_at = None
+
+
+class _ResponseCache:
+    """
+    SQLite-backed FMCSA response cache.
+
+    Lives on disk so warm entries survive restarts and are shared by every
+    worker process. Connections are opened lazily, one per thread, so the
+    FMCSA_CACHE_PATH override is read after .env has been loaded. Cache
+    failures are never fatal - a broken cache just means a live call.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            path = Path(os.getenv("FMCSA_CACHE_PATH") or _DEFAULT_CACHE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "path TEXT PRIMARY KEY, body BLOB NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, path: str, max_age: Optional[float] = None) -> Any:
+        """Parsed cached body for path, or None if missing (or older than max_age)."""
+        try:
+            row = self._conn().execute(
+                "SELECT body, fetched_at FROM responses WHERE path = ?", (path,)
+            ).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+        if row is None:
+            return None
+        body, fetched_at = row
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Corrupt or truncated body - drop it and let the caller refetch
+            try:
+                self._conn().execute("DELETE FROM responses WHERE path = ?", (path,))
+            except (sqlite3.Error, OSError):
+                pass
+            return None
+
+    def set(self, path: str, body: bytes) -> None:
+        """Store the raw JSON body for path."""
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO responses (path, body, fetched_at) VALUES (?, ?, ?)",
+                (path, body, time.time()),
+            )
+        except (sqlite3.Error, OSError):
+            pass
+
+
+_BREAKER = _CircuitBreaker(fail_max=5, reset_timeout=60.0)
+_CACHE = _ResponseCache()
+
+
+def _backoff(attempt: int) -> None:
+    """Sleep with jittered exponential backoff before the next attempt."""
+    delay = _BACKOFF_INITIAL * (2 ** attempt) + random.uniform(0, _BACKOFF_INITIAL)
+    time.sleep(min(delay, _BACKOFF_MAX))
+
+
+def _timeout_error(exc: httpx.TimeoutException) -> str:
+    """User-facing message that tells connect and read timeouts apart."""
+    if isinstance(exc, httpx.ConnectTimeout):
+        return "Error: Could not connect to FMCSA API (connection timed out). Try again."
+    return "Error: FMCSA API request timed out. Try again."
+
+
+def _stale_response(path: str) -> tuple[int, Any]:
+    data = _CACHE.get(path)
+    if data is None:
+        raise FMCSAUnavailableError("FMCSA API temporarily unreachable")
+    return 200, data
+
+
 class DOTLookupTools(Toolkit):
     """Tools for looking up DOT/FMCSA carrier information."""
 
@@ -49,6 +253,64 @@ class DOTLookupTools(Toolkit):
         self.register(self.search_carriers)
         self.register(self.check_safety_rating)
 
+    def _fetch(self, path: str) -> tuple[int, Any]:
+        """
+        GET an FMCSA endpoint with retries and the shared circuit breaker.
+
+        Fresh cached responses (under _CACHE_TTL) are returned without a
+        network call. Connect/read failures and 5xx responses are retried
+        with jittered exponential backoff, within an overall budget of
+        _RETRY_BUDGET seconds. While the circuit is open, the last cached
+        response for the same endpoint is served instead of calling FMCSA.
+
+        Returns:
+            (status_code, parsed JSON) for 200 responses,
+            (status_code, response text) otherwise
+        """
+        cached = _CACHE.get(path, max_age=_CACHE_TTL)
+        if cached is not None:
+            return 200, cached
+
+        if not _BREAKER.allow():
+            return _stale_response(path)
+
+        url = f"{self.base_url}/{path}"
+        params = {"webKey": self.api_key}
+        deadline = time.monotonic() + _RETRY_BUDGET
+
+        for attempt in range(_MAX_ATTEMPTS):
+            last_attempt = attempt + 1 == _MAX_ATTEMPTS or time.monotonic() >= deadline
+            try:
+                response = _CLIENT.get(url, params=params)
+            except _RETRY_EXCEPTIONS:
+                if last_attempt:
+                    _BREAKER.record_failure()
+                    raise
+                _backoff(attempt)
+                continue
+            except httpx.HTTPError:
+                # Not worth retrying (e.g. a protocol error), but still a failure
+                _BREAKER.record_failure()
+                raise
+
+            if response.status_code in _RETRY_STATUSES and not last_attempt:
+                _backoff(attempt)
+                continue
+            break
+
+        if response.status_code >= 500:
+            _BREAKER.record_failure()
+            return response.status_code, response.text
+
+        _BREAKER.record_success()
+
+        if response.status_code != 200:
+            return response.status_code, response.text
+
+        data = orjson.loads(response.content)
+        _CACHE.set(path, response.content)
+        return 200, data
+
     @observe_tool
     def lookup_dot_number(self, dot_number: str) -> str:
         """
@@ -61,40 +323,45 @@ class DOTLookupTools(Toolkit):
             str: Carrier information including name, address, operating status,
                  MC number, power units, and drivers
         """
+        return self.lookup_dot_number_raw(dot_number).text
+
+    def lookup_dot_number_raw(self, dot_number: str) -> LookupResult:
+        """
+        lookup_dot_number as a LookupResult, for workflows.
+
+        When found, fields holds legal_name, phone and address.
+        """
         if not dot_number or not dot_number.strip().isdigit():
-            return f"Invalid DOT number format: {dot_number}. DOT numbers should be numeric."
+            return LookupResult(
+                f"Invalid DOT number format: {dot_number}. DOT numbers should be numeric.", status="error"
+            )
 
         dot_number = dot_number.strip()
 
         if not self.api_key:
-            return "Error: FMCSA_API_KEY not configured. Set it in .env file."
-
-        url = f"{self.base_url}/carriers/{dot_number}"
-        params = {"webKey": self.api_key}
+            return LookupResult("Error: FMCSA_API_KEY not configured. Set it in .env file.", status="error")
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, params=params)
-
-                if response.status_code == 404:
-                    return f"No carrier found with DOT number: {dot_number}"
-
-                if response.status_code != 200:
-                    return f"FMCSA API error (status {response.status_code}): {response.text[:200]}"
+            status, data = self._fetch(f"carriers/{dot_number}")
+        except FMCSAUnavailableError:
+            return LookupResult("Error: FMCSA API temporarily unreachable. Try again shortly.", status="error")
+        except httpx.TimeoutException as e:
+            return LookupResult(_timeout_error(e), status="error")
+        except Exception as e:
+            return LookupResult(f"Error calling FMCSA API: {str(e)}", status="error")
 
-                data = response.json()
+        if status == 404:
+            return LookupResult(f"No carrier found with DOT number: {dot_number}")
 
-        except httpx.TimeoutException:
-            return "Error: FMCSA API request timed out. Try again."
-        except Exception as e:
-            return f"Error calling FMCSA API: {str(e)}"
+        if status != 200:
+            return LookupResult(f"FMCSA API error (status {status}): {data[:200]}", status="error")
 
         # Parse the response - FMCSA returns nested structure
         content = data.get("content", {})
         carrier = content.get("carrier", {})
 
         if not carrier:
-            return f"No carrier data returned for DOT {dot_number}"
+            return LookupResult(f"No carrier data returned for DOT {dot_number}")
 
         # Extract carrier info
         legal_name = carrier.get("legalName", "Unknown")
@@ -136,24 +403,25 @@ class DOTLookupTools(Toolkit):
         else:
             op_status = carrier.get("statusCode", "Unknown")
 
-        # Build output
-        output = [f"DOT Number: {dot_number}"]
-        output.append(f"Legal Name: {legal_name}")
-        if dba_name:
-            output.append(f"DBA: {dba_name}")
-        output.append(f"Entity Type: {entity_type}")
-        output.append(f"Operating Status: {op_status}")
-        output.append(f"Physical Address: {address}")
-        if phone:
-            output.append(f"Phone: {phone}")
-        if mc_number:
-            output.append(f"MC/MX Number: {mc_number}")
-        output.append(f"Power Units: {power_units}")
-        output.append(f"Drivers: {drivers}")
-        output.append(f"MCS-150 Date: {mcs150_date}")
-        output.append(f"Out of Service: {oos_status}")
-
-        return "\n".join(output)
+        text = _CARRIER_TEMPLATE.format_map({
+            "dot_number": dot_number,
+            "legal_name": legal_name,
+            "dba_line": f"DBA: {dba_name}\n" if dba_name else "",
+            "entity_type": entity_type,
+            "op_status": op_status,
+            "address": address,
+            "phone_line": f"Phone: {phone}\n" if phone else "",
+            "mc_line": f"MC/MX Number: {mc_number}\n" if mc_number else "",
+            "power_units": power_units,
+            "drivers": drivers,
+            "mcs150_date": mcs150_date,
+            "oos_status": oos_status,
+        })
+        return LookupResult(
+            text,
+            status="found",
+            fields={"legal_name": legal_name, "phone": phone, "address": address},
+        )
 
     @observe_tool
     def search_carriers(self, company_name: str, state: Optional[str] = None) -> str:
@@ -176,36 +444,33 @@ class DOTLookupTools(Toolkit):
         # URL encode the company name for the API
         import urllib.parse
         encoded_name = urllib.parse.quote(company_name.strip())
-        url = f"{self.base_url}/carriers/name/{encoded_name}"
-        params = {"webKey": self.api_key}
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, params=params)
-
-                if response.status_code != 200:
-                    return f"FMCSA API error (status {response.status_code})"
-
-                data = response.json()
-
-        except httpx.TimeoutException:
-            return "Error: FMCSA API request timed out."
+            status, data = self._fetch(f"carriers/name/{encoded_name}")
+        except FMCSAUnavailableError:
+            return "Error: FMCSA API temporarily unreachable. Try again shortly."
+        except httpx.TimeoutException as e:
+            return _timeout_error(e)
         except Exception as e:
             return f"Error calling FMCSA API: {str(e)}"
 
+        if status != 200:
+            return f"FMCSA API error (status {status})"
+
         content = data.get("content", [])
         if not content:
             return f'No carriers found matching "{company_name}"'
 
-        # Filter by state if provided
         if state:
             state = state.upper().strip()
-            content = [c for c in content if c.get("phyState", "").upper() == state]
-            if not content:
-                return f'No carriers found matching "{company_name}" in {state}'
 
-        # Limit results
-        content = content[:10]
+        # Filter by state (if provided) and stop at the first 10 matches
+        content = list(itertools.islice(
+            (c for c in content if not state or c.get("phyState", "").upper() == state),
+            10,
+        ))
+        if not content:
+            return f'No carriers found matching "{company_name}" in {state}'
 
         output = [f'Search results for "{company_name}"' + (f" in {state}" if state else "") + ":"]
         output.append("")
@@ -245,26 +510,21 @@ class DOTLookupTools(Toolkit):
             return "Error: FMCSA_API_KEY not configured."
 
         # Get BASIC scores
-        url = f"{self.base_url}/carriers/{dot_number}/basics"
-        params = {"webKey": self.api_key}
-
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(url, params=params)
-
-                if response.status_code == 404:
-                    return f"No safety data found for DOT {dot_number}"
-
-                if response.status_code != 200:
-                    return f"FMCSA API error (status {response.status_code})"
-
-                data = response.json()
-
-        except httpx.TimeoutException:
-            return "Error: FMCSA API request timed out."
+            status, data = self._fetch(f"carriers/{dot_number}/basics")
+        except FMCSAUnavailableError:
+            return "Error: FMCSA API temporarily unreachable. Try again shortly."
+        except httpx.TimeoutException as e:
+            return _timeout_error(e)
         except Exception as e:
             return f"Error calling FMCSA API: {str(e)}"
 
+        if status == 404:
+            return f"No safety data found for DOT {dot_number}"
+
+        if status != 200:
+            return f"FMCSA API error (status {status})"
+
         content = data.get("content", {})
 
         # Handle empty content (small carriers without BASIC data)
@@ -279,45 +539,34 @@ Check FMCSA SAFER for more details: https://safer.fmcsa.dot.gov/query.asp?search
         carrier = content.get("carrier", {})
         basics = content.get("basicsResult", [])
 
-        output = [f"Safety Information for DOT {dot_number}:"]
-        output.append("")
-
         # Safety rating from carrier info
         safety_rating = carrier.get("safetyRating", "Not Rated")
         rating_date = carrier.get("safetyRatingDate", "")
         oos_flag = carrier.get("oosFlag", "N")
 
-        output.append(f"Safety Rating: {safety_rating if safety_rating else 'Not Rated'}")
-        if rating_date:
-            output.append(f"Rating Date: {rating_date}")
-
-        if oos_flag == "Y":
-            output.append("*** OUT OF SERVICE ***")
+        output = [_SAFETY_HEADER_TEMPLATE.format_map({
+            "dot_number": dot_number,
+            "safety_rating": safety_rating if safety_rating else "Not Rated",
+            "rating_date_line": f"\nRating Date: {rating_date}" if rating_date else "",
+            "oos_line": "\n*** OUT OF SERVICE ***" if oos_flag == "Y" else "",
+        })]
 
         # BASIC scores
         if basics:
             output.append("")
             output.append("BASIC Scores (percentile):")
 
-            basic_names = {
-                "Unsafe Driving": "unsafeDriving",
-                "Hours-of-Service": "hos",
-                "Driver Fitness": "driverFitness",
-                "Controlled Substances": "controlledSubstance",
-                "Vehicle Maintenance": "vehicleMaintenance",
-                "Hazmat Compliance": "hazmat",
-                "Crash Indicator": "crashIndicator"
-            }
-
-            for display_name, key in basic_names.items():
-                for basic in basics:
-                    if basic.get("basicsType", "").lower().replace(" ", "").replace("-", "") == key.lower():
-                        percentile = basic.get("basicsPercentile", "N/A")
-                        if percentile != "N/A":
-                            output.append(f"- {display_name}: {percentile}%")
-                        else:
-                            output.append(f"- {display_name}: N/A")
-                        break
+            # Normalize each basicsType once; keep the first entry per type
+            by_type = {}
+            for basic in basics:
+                key = basic.get("basicsType", "").lower().replace(" ", "").replace("-", "")
+                by_type.setdefault(key, basic)
+
+            for display_name, key in _BASIC_NAMES.items():
+                basic = by_type.get(key)
+                percentile = basic.get("basicsPercentile", "N/A") if basic else "N/A"
+                if percentile != "N/A":
+                    output.append(f"- {display_name}: {percentile}%")
                 else:
                     output.append(f"- {display_name}: N/A")
 
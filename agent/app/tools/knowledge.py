@@ -4,10 +4,125 @@ Knowledge Tools
 Tools for answering questions about insurance processes and procedures.
 """
 
+import mmap
+import re
+from functools import lru_cache
+from pathlib import Path
+
 from agno.tools.toolkit import Toolkit
 
 from app.observability import observe_tool
 
+_BODIES_PATH = Path(__file__).with_name("knowledge_bodies.txt")
+_SECTION_MARKER = b"@@ "
+
+
+class _BodyStore:
+    """
+    Response bodies memory-mapped from knowledge_bodies.txt.
+
+    Each section starts with an "@@ <bucket>/<key>" header line; the body runs
+    until the newline before the next header. Only byte offsets are indexed at
+    import, and a body is decoded the first time it is actually requested.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # bucket -> {key: (offset, length)}, keys in file (priority) order
+        self._sections: dict[str, dict[str, tuple[int, int]]] = {}
+        size = len(self._mm)
+        start = 0 if self._mm[: len(_SECTION_MARKER)] == _SECTION_MARKER else -1
+        while start != -1:
+            header_end = self._mm.find(b"\n", start)
+            next_start = self._mm.find(b"\n" + _SECTION_MARKER, header_end)
+            body_end = next_start if next_start != -1 else size - 1
+            name = self._mm[start + len(_SECTION_MARKER):header_end].decode("utf-8")
+            bucket, _, key = name.partition("/")
+            offset = header_end + 1
+            self._sections.setdefault(bucket, {})[key] = (offset, body_end - offset)
+            start = next_start + 1 if next_start != -1 else -1
+
+    def keys(self, bucket: str) -> list[str]:
+        return list(self._sections[bucket])
+
+    def body(self, bucket: str, key: str) -> str:
+        offset, length = self._sections[bucket][key]
+        return self._mm[offset:offset + length].decode("utf-8")
+
+
+_BODIES = _BodyStore(_BODIES_PATH)
+
+
+# Extra keywords that resolve to an existing entry, in addition to its key.
+# "new" maps to authority so "new authority" questions land there first.
+_PROCESS_ALIASES = {
+    "broker bond": ("bmc-84", "bmc84", "bmc 84"),
+}
+_COVERAGE_ALIASES: dict[str, tuple[str, ...]] = {}
+_REQUIREMENT_ALIASES = {
+    "authority": ("new",),
+    "mcs-150": ("mcs150",),
+}
+
+
+class _KeywordIndex:
+    """
+    Keyword -> response body lookup.
+
+    All keywords are compiled into a single regex at import time, so a topic
+    is scanned once regardless of how many keywords or aliases exist. The
+    zero-width lookahead reports every keyword occurrence (including
+    overlapping ones) and the earliest-declared keyword wins, matching the
+    original "first key contained in the topic" behavior.
+    """
+
+    def __init__(self, bucket: str, aliases: dict[str, tuple[str, ...]]):
+        self._bucket = bucket
+        self._keys: dict[str, str] = {}
+        for key in _BODIES.keys(bucket):
+            self._keys[key] = key
+            for alias in aliases.get(key, ()):
+                self._keys[alias] = key
+
+        self._priority = {keyword: i for i, keyword in enumerate(self._keys)}
+        alternation = "|".join(re.escape(keyword) for keyword in self._keys)
+        self._pattern = re.compile(f"(?=({alternation}))")
+
+    def lookup(self, text: str) -> str | None:
+        """Exact keyword hit first, then the highest-priority keyword in the text."""
+        keyword = text if text in self._keys else min(
+            (match.group(1) for match in self._pattern.finditer(text)),
+            key=self._priority.__getitem__,
+            default=None,
+        )
+        if keyword is None:
+            return None
+        return _BODIES.body(self._bucket, self._keys[keyword])
+
+
+_PROCESS_INDEX = _KeywordIndex("process", _PROCESS_ALIASES)
+_COVERAGE_INDEX = _KeywordIndex("coverage", _COVERAGE_ALIASES)
+_REQUIREMENT_INDEX = _KeywordIndex("compliance", _REQUIREMENT_ALIASES)
+
+
+# Agents ask about the same handful of topics repeatedly; memoize on the
+# normalized topic so repeat questions return the same string object.
+@lru_cache(maxsize=256)
+def _process_info(topic_lower: str) -> str | None:
+    return _PROCESS_INDEX.lookup(topic_lower)
+
+
+@lru_cache(maxsize=256)
+def _coverage_info(coverage_lower: str) -> str | None:
+    return _COVERAGE_INDEX.lookup(coverage_lower)
+
+
+@lru_cache(maxsize=256)
+def _compliance_info(req_lower: str) -> str | None:
+    return _REQUIREMENT_INDEX.lookup(req_lower)
+
 
 class KnowledgeTools(Toolkit):
     """Tools for answering insurance knowledge questions."""
@@ -33,134 +148,9 @@ class KnowledgeTools(Toolkit):
         Returns:
             str: Detailed process information and steps
         """
-        topic_lower = topic.lower()
-
-        processes = {
-            "broker bond": """Broker Bond (BMC-84) Process:
-
-A broker bond (BMC-84) is required for freight brokers operating under FMCSA authority.
-
-Requirements:
-- Valid FMCSA broker authority (MC number)
-- $75,000 surety bond or trust fund
-- Must be filed with FMCSA before operating
-
-Our Process:
-1. Verify customer has MC authority (or pending application)
-2. Collect application and financials
-3. Submit to surety company for approval
-4. Once approved, file BMC-84 with FMCSA
-5. Provide proof of filing to customer
-
-Timeline: 2-5 business days typically
-Cost: Premium typically 1-10% of bond amount based on credit
-
-Documents Needed:
-- Broker authority letter or MC number
-- Business financials (last 2 years)
-- Personal financial statement
-- Completed broker bond application""",
-
-            "cargo claim": """Cargo Claims Process:
-
-When a cargo claim is reported:
-
-Immediate Steps:
-1. Document the claim (date, load details, nature of damage/loss)
-2. Get photos of damage if available
-3. Obtain Bill of Lading and delivery receipt
-4. Report to carrier within 24 hours if possible
-
-Filing Process:
-1. Complete carrier's claim form
-2. Attach supporting documentation:
-   - Bill of Lading
-   - Delivery receipt with noted exceptions
-   - Photos of damage
-   - Invoice showing cargo value
-   - Repair estimates if applicable
-3. Submit to carrier within policy timeframe
-4. Follow up regularly until resolved
-
-Time Limits:
-- Report to carrier: ASAP, within 9 months max
-- File formal claim: Within 9 months of delivery
-- Lawsuit if needed: Within 2 years
-
-RMS Role:
-- Assist with documentation
-- Submit to insurance carrier
-- Track and follow up on claim
-- Advocate for customer""",
-
-            "new policy": """New Policy Process:
-
-Steps to Quote and Bind:
-
-1. Gather Information:
-   - DOT/MC number
-   - Years in business
-   - Driver list with MVRs
-   - Vehicle schedule
-   - Loss history (3-5 years)
-   - Current coverage (if any)
-
-2. Risk Assessment:
-   - Run FMCSA safety report
-   - Review BASIC scores
-   - Analyze commodities hauled
-   - Check operating radius
-
-3. Submit to Markets:
-   - Prepare submission package
-   - Send to appropriate carriers
-   - Follow up on quotes
-
-4. Quote Presentation:
-   - Review options with customer
-   - Explain coverages and limits
-   - Answer questions
-
-5. Bind Coverage:
-   - Collect signed applications
-   - Obtain payment (deposit or full)
-   - Request binder from carrier
-   - File FMCSA filings if needed
-   - Issue certificates as requested
-
-Timeline: 3-7 business days for quotes""",
-
-            "certificate request": """Certificate of Insurance Request Process:
-
-Standard COI:
-1. Verify policy is active
-2. Generate certificate in NowCerts
-3. Email or fax to requestor
-4. File copy in system
-
-Additional Insured Request:
-1. Verify policy allows additional insureds
-2. Review contract requirements
-3. Check if AI endorsement is needed
-4. Process endorsement if required
-5. Generate certificate with AI status
-6. Send to requestor
-
-Turnaround:
-- Standard COI: Same day
-- With endorsement: 1-2 business days
-
-Common Certificate Holders:
-- Freight brokers
-- Shippers
-- Facilities/warehouses
-- Lenders""",
-        }
-
-        # Try to find matching process
-        for key, info in processes.items():
-            if key in topic_lower:
-                return info
+        info = _process_info(topic.lower())
+        if info is not None:
+            return info
 
         # Generic response if no match
         return f"""I don't have specific process documentation for "{topic}".
@@ -184,131 +174,9 @@ Please ask about one of these topics or provide more details about what you need
         Returns:
             str: Coverage details, typical limits, and requirements
         """
-        coverage_lower = coverage_type.lower()
-
-        coverages = {
-            "cargo": """Cargo Insurance Coverage:
-
-What It Covers:
-- Damage to freight being transported
-- Theft of cargo
-- Loss during loading/unloading
-
-Standard Limits:
-- $100,000 per occurrence (typical minimum)
-- Some shippers require higher limits
-- Reefer breakdown usually included
-
-Exclusions:
-- Normal shrinkage
-- Inherent vice
-- Nuclear hazard
-- War/terrorism
-- Intentional acts
-
-FMCSA Requirements:
-- Carriers of household goods: Required
-- Other for-hire carriers: Not federally required but usually contractually required
-
-Premium Factors:
-- Commodities hauled
-- Radius of operation
-- Claims history
-- Deductible chosen""",
-
-            "auto liability": """Auto Liability (AL) Coverage:
-
-What It Covers:
-- Bodily injury to others
-- Property damage to others
-- Defense costs
-
-FMCSA Minimum Limits:
-- General freight: $750,000
-- Hazmat: $1,000,000 - $5,000,000
-- Passenger carriers: $1.5M - $5M
-
-Common Limits We Write:
-- $1,000,000 CSL (Combined Single Limit)
-- Split limits available but less common
-
-Filing Requirements:
-- BMC-91 (surety bond) or BMC-91X (trust fund)
-- Filed with FMCSA
-- Must maintain continuous coverage
-
-Premium Factors:
-- Number of power units
-- Number of drivers
-- Driver experience/MVRs
-- Radius of operation
-- Safety scores
-- Claims history""",
-
-            "physical damage": """Physical Damage Coverage:
-
-What It Covers:
-- Comprehensive: Fire, theft, vandalism, weather, etc.
-- Collision: Damage from accidents
-
-Coverage Options:
-- Stated value
-- Actual Cash Value (ACV)
-- Replacement cost (rare)
-
-Typical Deductibles:
-- $1,000 - $2,500 comprehensive
-- $1,000 - $5,000 collision
-- Higher deductibles = lower premium
-
-What It Doesn't Cover:
-- Mechanical breakdown
-- Wear and tear
-- Intentional damage
-- Items inside vehicle (separate coverage needed)
-
-Premium Factors:
-- Vehicle value
-- Vehicle age
-- Garaging location
-- Loss history
-- Deductible chosen""",
-
-            "general liability": """General Liability (GL) Coverage:
-
-What It Covers:
-- Third-party bodily injury (off-road)
-- Third-party property damage (off-road)
-- Personal injury (libel, slander)
-- Advertising injury
-- Medical payments
-
-Common Limits:
-- $1,000,000 per occurrence
-- $2,000,000 general aggregate
-- $1,000,000 products-completed ops
-
-What It Doesn't Cover:
-- Auto-related claims (covered by AL)
-- Professional services (need E&O)
-- Employee injuries (need WC)
-- Intentional acts
-
-Who Needs It:
-- Anyone with an office or terminal
-- If you hire subcontractors
-- If contracts require it
-
-Premium Factors:
-- Payroll
-- Revenue
-- Location
-- Operations type""",
-        }
-
-        for key, info in coverages.items():
-            if key in coverage_lower:
-                return info
+        info = _coverage_info(coverage_type.lower())
+        if info is not None:
+            return info
 
         return f"""I don't have specific information for "{coverage_type}" coverage.
 
@@ -331,108 +199,9 @@ Please ask about one of these or specify what coverage you need information abou
         Returns:
             str: Compliance requirements and process
         """
-        req_lower = requirement_type.lower()
-
-        requirements = {
-            "authority": """New FMCSA Authority Requirements:
-
-To operate as a for-hire motor carrier:
-
-1. USDOT Number:
-   - Required for all interstate carriers
-   - Free to obtain through FMCSA
-   - Needed before MC authority
-
-2. MC Authority (if for-hire):
-   - Operating Authority to haul freight
-   - Apply through FMCSA
-   - $300 filing fee
-   - 10-day protest period after approval
-
-3. Insurance Requirements (before operating):
-   - BMC-91 or 91X filing (liability)
-   - BMC-34 filing (cargo) if household goods
-   - Must be filed by insurance company
-
-4. Process Agent (BOC-3):
-   - Designate agents in each state you operate
-   - Required before authority activates
-   - Many services offer this for ~$50
-
-5. UCR (Unified Carrier Registration):
-   - Annual registration
-   - Fee based on fleet size
-   - Must be current to operate
-
-Timeline: 3-6 weeks typically""",
-
-            "insurance filing": """FMCSA Insurance Filing Requirements:
-
-Required Filings:
-
-BMC-91 or BMC-91X (Liability):
-- Required for all for-hire carriers
-- Must meet minimum limits for your operation
-- Filed electronically by insurance carrier
-- Must remain active - lapse = authority revocation
-
-BMC-34 (Cargo):
-- Required for household goods carriers only
-- $5,000 minimum per vehicle
-- $10,000 aggregate minimum
-
-BMC-84 (Broker Bond):
-- Required for freight brokers
-- $75,000 minimum
-- Must be surety bond or trust fund
-
-Filing Process:
-1. Bind coverage with FMCSA-authorized insurer
-2. Insurer files electronically with FMCSA
-3. Allow 24-48 hours for processing
-4. Verify filing on FMCSA website
-
-Cancellation:
-- 30-day notice required
-- Must maintain coverage or cease operations
-- Lapse can result in authority revocation""",
-
-            "mcs-150": """MCS-150 Biennial Update Requirements:
-
-What Is It:
-- Motor Carrier Identification Report
-- Must be updated every 2 years
-- Based on USDOT number (odd/even)
-
-When to Update:
-- Every 24 months based on USDOT number
-- Odd numbers: Odd years
-- Even numbers: Even years
-- Also after any significant changes
-
-Information Required:
-- Company name and address
-- Contact information
-- Type of operation
-- Cargo types
-- Number of power units
-- Number of drivers
-- Vehicle miles traveled
-
-How to File:
-- Online through FMCSA portal (free)
-- Paper form available
-- Third-party services available
-
-Penalties for Non-Compliance:
-- Up to $1,000 per day fine
-- Can affect safety rating
-- May impact insurance rates""",
-        }
-
-        for key, info in requirements.items():
-            if key in req_lower or (key == "authority" and "new" in req_lower):
-                return info
+        info = _compliance_info(requirement_type.lower())
+        if info is not None:
+            return info
 
         return f"""I don't have specific compliance information for "{requirement_type}".
 
@@ -4,7 +4,14 @@ Notes Tools
 Persistent memory for the RMS agent - remembers things across sessions.
 """
 
+import atexit
+import logging
+import mmap
 import os
+import queue
+import re
+import string
+import threading
 from pathlib import Path
 from datetime import datetime
 from agno.tools.toolkit import Toolkit
@@ -12,36 +19,310 @@ from typing import Optional
 
 from app.observability import observe_tool
 
+log = logging.getLogger(__name__)
+
+# Default: agent/notes/ (sibling to app/)
+_BUNDLED_NOTES_DIR = Path(__file__).resolve().parents[2] / "notes"
+
+# Lookup order when a subject isn't in the requested category
+_RECALL_ORDER = ("carriers", "patterns", "general")
+_VALID_CATEGORIES = frozenset(_RECALL_ORDER)
+
+# Subdirectories of a notes root
+_NOTES_SUBDIRS = ("carriers", "patterns", "daily")
+
+# Subject -> filename sanitizing: ASCII goes through a translate table, other
+# text through the equivalent Unicode-aware regex (\w == isalnum() plus "_").
+_SANITIZE_TABLE = str.maketrans({
+    c: "_" for c in map(chr, range(128))
+    if c not in string.ascii_letters + string.digits + "-_"
+})
+_UNSAFE_CHARS = re.compile(r"[^\w-]")
+
+# Append-only note writes; O_CLOEXEC isn't available on Windows
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | getattr(os, "O_CLOEXEC", 0)
+_HAS_WRITEV = hasattr(os, "writev")
+_IOV_MAX = 1024
+# Windows has no fdatasync; fsync is the closest equivalent there
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+# Notes larger than this are memory-mapped instead of read through a buffer
+_MMAP_MIN_SIZE = 64 * 1024
+
+# How long interpreter exit waits for queued notes before giving up on them
+_EXIT_FLUSH_TIMEOUT = 5.0
+
+
+def _append_entries(file_path: str, header: bytes, entries: list[bytes]) -> None:
+    """
+    Append entries to a note file, writing the header first if it is new.
+
+    Uses a raw O_APPEND descriptor: one unbuffered write for the whole batch
+    (header included), followed by one data sync. O_CLOEXEC keeps the
+    descriptor from leaking into subprocesses, and O_EXCL tells us atomically
+    whether we created the file and so owe it a header.
+    """
+    parts = list(entries)
+    try:
+        try:
+            fd = os.open(file_path, _APPEND_FLAGS | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileNotFoundError:
+            # Directory removed since setup (e.g. notes wiped between test runs)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            fd = os.open(file_path, _APPEND_FLAGS | os.O_CREAT | os.O_EXCL, 0o644)
+        parts.insert(0, header)
+    except FileExistsError:
+        fd = os.open(file_path, _APPEND_FLAGS)
+
+    try:
+        # One write syscall either way; writev skips joining the parts
+        if _HAS_WRITEV and len(parts) <= _IOV_MAX:
+            os.writev(fd, parts)
+        else:
+            os.write(fd, b"".join(parts))
+        _datasync(fd)
+    finally:
+        os.close(fd)
+
+
+class _NoteWriter:
+    """
+    Background appender shared by every NotesTools instance.
+
+    remember() and log_daily() enqueue (path, header, entry) and return. A
+    daemon thread drains whatever has queued up, groups it by file and makes
+    one write plus one data sync per file, so bursts of notes share the cost
+    of durability. flush() blocks until everything queued so far is on disk;
+    readers call it first so they always see their own writes.
+
+    Writes that fail are logged and their paths kept until the next
+    take_failures(), so the tools can tell the agent a note was lost.
+    """
+
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._failed: list[str] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, file_path: str, header: str, entry: str) -> None:
+        """
+        Queue an entry for file_path.
+
+        Raises:
+            UnicodeEncodeError: If header or entry can't be stored as UTF-8
+                (e.g. a lone surrogate); nothing is queued then
+        """
+        data = (file_path, header.encode("utf-8"), entry.encode("utf-8"))
+        with self._idle:
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="notes-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush, _EXIT_FLUSH_TIMEOUT)
+        self._queue.put(data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued notes to be written. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def take_failures(self) -> list[str]:
+        """Paths whose writes failed since the last call."""
+        with self._idle:
+            failed, self._failed = self._failed, []
+        return failed
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            failed = []
+            try:
+                by_path: dict[str, tuple[bytes, list[bytes]]] = {}
+                for file_path, header, entry in batch:
+                    by_path.setdefault(file_path, (header, []))[1].append(entry)
+
+                for file_path, (header, entries) in by_path.items():
+                    try:
+                        _append_entries(file_path, header, entries)
+                    except Exception:
+                        log.exception("Failed to write note file %s", file_path)
+                        failed.append(file_path)
+            finally:
+                # Always settle the batch, or flush() would wait forever
+                with self._idle:
+                    self._failed.extend(failed)
+                    self._pending -= len(batch)
+                    self._idle.notify_all()
+
+
+_WRITER = _NoteWriter()
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """A directory's mtime, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _default_notes_dir() -> Path:
+    """
+    Notes root for NotesTools built without one.
+
+    The RMS_NOTES_DIR setting (see .env.example) moves it, e.g. to persistent
+    storage in a deployment. Read per call rather than at import, so a value
+    from .env counts even though app.agent imports this module first.
+    """
+    return Path(os.getenv("RMS_NOTES_DIR") or _BUNDLED_NOTES_DIR)
+
+
+def _failure_notice() -> str:
+    """Warning to append to a tool result if any note writes have failed."""
+    failed = _WRITER.take_failures()
+    if not failed:
+        return ""
+    names = ", ".join(sorted({os.path.basename(path) for path in failed}))
+    return f"\n\nWarning: earlier notes could not be saved ({names})"
+
+
+def _truncate(text: str, limit: int = 100) -> str:
+    """Preview of text for confirmations, with "..." when it was cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _safe_name(subject: str) -> str:
+    """Filename-safe form of a subject: anything but letters, digits, - and _ becomes _."""
+    if subject.isascii():
+        return subject.translate(_SANITIZE_TABLE)
+    return _UNSAFE_CHARS.sub("_", subject)
+
+
+def _read_note(file_path: str) -> str:
+    """Read a note file, memory-mapping it when it is large."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = mm[:]
+        else:
+            raw = f.read()
+
+    content = raw.decode("utf-8")
+    # Match text-mode reads (universal newlines) for files written on Windows
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
 
 class NotesTools(Toolkit):
     """Tools for persisting notes and memories across sessions."""
 
+    # Notes roots whose directory tree is known to exist in this process
+    _initialized_dirs: set[Path] = set()
+
     def __init__(self, notes_dir: Optional[str] = None):
         """
         Initialize notes tools.
 
         Args:
-            notes_dir: Directory for notes storage (default: agent/notes/)
+            notes_dir: Directory for notes storage (default: $RMS_NOTES_DIR,
+                else agent/notes/)
+        """
+        super().__init__(
+            name="notes",
+            tools=[self.remember, self.recall, self.list_carrier_notes, self.log_daily],
+        )
+
+        self.notes_dir = Path(notes_dir) if notes_dir else _default_notes_dir()
+
+        # Category -> directory holding its notes ("general" lives in the root).
+        # Kept as plain strings: per-call note paths are built with
+        # os.path.join rather than Path division.
+        root = os.fspath(self.notes_dir)
+        self._category_dirs: dict[str, str] = {
+            cat: root if cat == "general" else os.path.join(root, cat)
+            for cat in _RECALL_ORDER
+        }
+        self._daily_dir = os.path.join(root, "daily")
+
+        # safe_subject -> (category, path), built lazily for cross-category recall
+        self._index: Optional[dict[str, tuple[str, str]]] = None
+        self._index_mtimes: Optional[tuple[Optional[int], ...]] = None
+
+        # Create directory structure (once per notes root per process)
+        if self.notes_dir not in NotesTools._initialized_dirs:
+            self._ensure_dirs()
+            NotesTools._initialized_dirs.add(self.notes_dir)
+
+    def _ensure_dirs(self) -> None:
+        """Create the notes root and any missing subdirectories."""
+        try:
+            with os.scandir(self.notes_dir) as it:
+                existing = {entry.name for entry in it if entry.is_dir()}
+        except FileNotFoundError:
+            self.notes_dir.mkdir(parents=True, exist_ok=True)
+            existing = set()
+
+        for subdir in _NOTES_SUBDIRS:
+            if subdir not in existing:
+                (self.notes_dir / subdir).mkdir(exist_ok=True)
+
+    def _find_subject(self, safe_subject: str) -> Optional[tuple[str, str]]:
         """
-        super().__init__(name="notes")
+        Find a subject's notes in any category via the in-memory index.
 
-        if notes_dir:
-            self.notes_dir = Path(notes_dir)
-        else:
-            # Default: agent/notes/ (sibling to app/)
-            self.notes_dir = Path(__file__).parent.parent.parent / "notes"
+        The index is rebuilt only when one of the category directories'
+        mtimes changes and is kept current by remember(), so a miss never
+        probes per-subject paths.
+        """
+        # A missing category directory keys as None and contributes nothing,
+        # so recall still finds notes in the others
+        mtimes = tuple(_mtime_ns(d) for d in self._category_dirs.values())
+
+        if self._index is None or mtimes != self._index_mtimes:
+            index: dict[str, tuple[str, str]] = {}
+            for (cat, cat_dir), mtime in zip(self._category_dirs.items(), mtimes):
+                if mtime is None:
+                    continue
+                try:
+                    with os.scandir(cat_dir) as it:
+                        for entry in it:
+                            if entry.name.endswith(".md") and entry.is_file():
+                                index.setdefault(entry.name[:-3], (cat, entry.path))
+                except FileNotFoundError:
+                    continue
+            self._index = index
+            self._index_mtimes = mtimes
+
+        return self._index.get(safe_subject)
+
+    def _index_note(self, safe_subject: str, category: str, file_path: str) -> None:
+        """Record a written note in the recall index, respecting category order."""
+        if self._index is None:
+            return
+        existing = self._index.get(safe_subject)
+        if existing is None or _RECALL_ORDER.index(category) < _RECALL_ORDER.index(existing[0]):
+            self._index[safe_subject] = (category, file_path)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every note queued by remember()/log_daily() is on disk.
 
-        # Create directory structure
-        self.notes_dir.mkdir(exist_ok=True)
-        (self.notes_dir / "carriers").mkdir(exist_ok=True)
-        (self.notes_dir / "patterns").mkdir(exist_ok=True)
-        (self.notes_dir / "daily").mkdir(exist_ok=True)
+        Args:
+            timeout: Seconds to wait (default: no limit)
 
-        # Register tools
-        self.register(self.remember)
-        self.register(self.recall)
-        self.register(self.list_carrier_notes)
-        self.register(self.log_daily)
+        Returns:
+            bool: False if the timeout expired first
+        """
+        return _WRITER.flush(timeout)
 
     @observe_tool
     def remember(
@@ -68,33 +349,29 @@ class NotesTools(Toolkit):
             return "Error: Both subject and note are required"
 
         # Sanitize subject for filename
-        safe_subject = "".join(c if c.isalnum() or c in "-_" else "_" for c in subject)
+        safe_subject = _safe_name(subject)
 
         # Determine file path
-        if category not in ("carriers", "patterns", "general"):
+        if category not in _VALID_CATEGORIES:
             category = "carriers"
 
-        if category == "general":
-            file_path = self.notes_dir / f"{safe_subject}.md"
-        else:
-            file_path = self.notes_dir / category / f"{safe_subject}.md"
+        file_path = os.path.join(self._category_dirs[category], f"{safe_subject}.md")
 
         # Create timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        now = datetime.now()
+        timestamp = f"{now.year:04d}-{now.month:02d}-{now.day:02d} {now.hour:02d}:{now.minute:02d}"
 
         # Append to file (create if doesn't exist)
         entry = f"\n## {timestamp}\n{note}\n"
 
-        if file_path.exists():
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(entry)
-        else:
-            # Create new file with header
-            header = f"# Notes: {subject}\n\nCategory: {category}\n"
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(header + entry)
+        header = f"# Notes: {subject}\n\nCategory: {category}\n"
+        try:
+            _WRITER.submit(file_path, header, entry)
+        except UnicodeEncodeError as e:
+            return f"Error: Could not save note about {subject}: {e.reason}"
+        self._index_note(safe_subject, category, file_path)
 
-        return f"Remembered about {subject} ({category}): {note[:100]}{'...' if len(note) > 100 else ''}"
+        return f"Remembered about {subject} ({category}): {_truncate(note)}{_failure_notice()}"
 
     @observe_tool
     def recall(
@@ -118,33 +395,28 @@ class NotesTools(Toolkit):
             return "Error: Subject is required"
 
         # Sanitize subject for filename
-        safe_subject = "".join(c if c.isalnum() or c in "-_" else "_" for c in subject)
+        safe_subject = _safe_name(subject)
 
         # Determine file path
-        if category not in ("carriers", "patterns", "general"):
+        if category not in _VALID_CATEGORIES:
             category = "carriers"
 
-        if category == "general":
-            file_path = self.notes_dir / f"{safe_subject}.md"
-        else:
-            file_path = self.notes_dir / category / f"{safe_subject}.md"
+        file_path = os.path.join(self._category_dirs[category], f"{safe_subject}.md")
 
-        if not file_path.exists():
+        _WRITER.flush()
+        try:
+            content = _read_note(file_path)
+        except FileNotFoundError:
             # Try other categories
-            for cat in ["carriers", "patterns", "general"]:
-                if cat == "general":
-                    alt_path = self.notes_dir / f"{safe_subject}.md"
-                else:
-                    alt_path = self.notes_dir / cat / f"{safe_subject}.md"
-                if alt_path.exists():
-                    file_path = alt_path
-                    category = cat
-                    break
-            else:
+            found = self._find_subject(safe_subject)
+            if found is None or found[1] == file_path:
+                return f"No notes found for {subject}"
+            category, file_path = found
+            try:
+                content = _read_note(file_path)
+            except FileNotFoundError:
+                self._index = None
                 return f"No notes found for {subject}"
-
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
 
         return f"Notes for {subject} ({category}):\n\n{content}"
 
@@ -156,28 +428,30 @@ class NotesTools(Toolkit):
         Returns:
             str: List of carriers that have notes stored
         """
-        carriers_dir = self.notes_dir / "carriers"
+        carriers_dir = self._category_dirs["carriers"]
+        _WRITER.flush()
 
-        if not carriers_dir.exists():
+        try:
+            with os.scandir(carriers_dir) as it:
+                entries = [e for e in it if e.name.endswith(".md")]
+        except FileNotFoundError:
             return "No carrier notes yet"
 
-        files = list(carriers_dir.glob("*.md"))
-
-        if not files:
+        if not entries:
             return "No carrier notes yet"
 
         output = ["Carriers with notes:\n"]
 
-        for f in sorted(files):
-            # Get file stats
-            stat = f.stat()
+        for entry in sorted(entries, key=lambda e: e.name):
+            # DirEntry.stat() reuses what scandir already fetched where possible;
+            # size comes from the stat too, so no note file is read
+            stat = entry.stat()
             modified = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
-            size_lines = len(f.read_text(encoding="utf-8").split("\n"))
 
-            carrier_name = f.stem
-            output.append(f"- {carrier_name} (updated {modified}, {size_lines} lines)")
+            carrier_name = entry.name[:-3]
+            output.append(f"- {carrier_name} (updated {modified}, {stat.st_size / 1024:.1f} KB)")
 
-        output.append(f"\nTotal: {len(files)} carrier(s)")
+        output.append(f"\nTotal: {len(entries)} carrier(s)")
         return "\n".join(output)
 
     @observe_tool
@@ -196,19 +470,18 @@ class NotesTools(Toolkit):
         if not entry:
             return "Error: Entry is required"
 
-        today = datetime.now().strftime("%Y-%m-%d")
-        timestamp = datetime.now().strftime("%H:%M")
+        # One clock read so the date and time can't straddle midnight
+        now = datetime.now()
+        today = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+        timestamp = f"{now.hour:02d}:{now.minute:02d}"
 
-        file_path = self.notes_dir / "daily" / f"{today}.md"
+        file_path = os.path.join(self._daily_dir, f"{today}.md")
 
         log_entry = f"\n- **{timestamp}** - {entry}\n"
 
-        if file_path.exists():
-            with open(file_path, "a", encoding="utf-8") as f:
-                f.write(log_entry)
-        else:
-            header = f"# Daily Log: {today}\n"
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(header + log_entry)
+        try:
+            _WRITER.submit(file_path, f"# Daily Log: {today}\n", log_entry)
+        except UnicodeEncodeError as e:
+            return f"Error: Could not log entry: {e.reason}"
 
-        return f"Logged: {entry[:100]}{'...' if len(entry) > 100 else ''}"
+        return f"Logged: {_truncate(entry)}{_failure_notice()}"
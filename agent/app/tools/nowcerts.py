@@ -5,14 +5,294 @@ Tools for managing insurance policies and certificates in NowCerts AMS.
 Uses real NowCerts API with bearer token authentication.
 """
 
+import contextvars
+import hashlib
+import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import httpx
+import orjson
 from agno.tools.toolkit import Toolkit
 from typing import Optional
 from datetime import datetime, timedelta
 
 from app.observability import observe_tool
+from app.tools.results import LookupResult
+
+log = logging.getLogger(__name__)
+
+# Shared by the API and identity clients; idle connections are kept for reuse
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+
+_CLIENT_ID = "nowcerts_public_api"
+
+# Sent on every API call. metadata=minimal keeps OData from annotating each
+# row (@odata.etag, type/navigation links), and maxpagesize asks the server
+# not to split a $top-sized page into server-driven pages.
+_API_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json;odata.metadata=minimal",
+    "Prefer": "odata.maxpagesize=1000",
+}
+
+# Process-wide token store: sha256(username|client_id) ->
+# (access_token, refresh_token, expires_at). Shared by every NowCertsTools
+# instance so only one of them pays for a token request.
+_TOKEN_CACHE: dict[str, tuple[Optional[str], Optional[str], float]] = {}
+_TOKEN_LOCK = threading.Lock()
+
+# Gateway errors worth one more try before the agent sees them; retries back
+# off from _RETRY_DELAY, or wait what Retry-After asks (up to _MAX_RETRY_DELAY)
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_MAX_ATTEMPTS = 3
+_RETRY_DELAY = 0.2
+_MAX_RETRY_DELAY = 5.0
+
+# OData list paging: rows per page, pages requested concurrently per round,
+# and a hard cap so a runaway listing can't page forever
+_PAGE_SIZE = 500
+_PAGE_FANOUT = 4
+_MAX_PAGES = 20
+
+# Runs _get_many() fan-outs: each request goes through _make_request() on the
+# instance's long-lived client, whose HTTP/2 connection multiplexes them.
+# Separate from app.concurrency's pool, since tools calling _get_many() may
+# themselves be running there.
+_FANOUT_POOL = ThreadPoolExecutor(max_workers=_MAX_PAGES, thread_name_prefix="nowcerts-fanout")
+
+# The first InsuredList page that client-side scans match against; kept this
+# many seconds so a burst of DOT searches (e.g. renewal_check's snapshots)
+# downloads it once
+_INSURED_PAGE_TTL = 60
+# NowCerts requires $top, $skip, $orderby for InsuredList
+_INSURED_PAGE_PARAMS = {"$top": "500", "$skip": "0", "$orderby": "commercialName"}
+
+# The PolicyList fields get_expiring_policies reads; asking for just these
+# keeps multi-page expiring-policy responses small
+_EXPIRING_SELECT = "id,policyNumber,policyType,insuredName,expirationDate,premium"
+
+# Response skeletons - optional lines are pre-rendered (with their trailing
+# newline) or empty, so each row is a single format call.
+_INSURED_ROW_TEMPLATE = (
+    "{i}. Insured ID: {insured_id}\n"
+    "   Name: {name}\n"
+    "{phone_line}"
+    "{email_line}"
+    "{location_line}"
+)
+
+_POLICY_ROW_TEMPLATE = (
+    "{i}. {policy_num} - {policy_type}\n"
+    "   Status: {status}\n"
+    "   Effective: {eff_date} to {exp_date}\n"
+    "{premium_line}"
+)
+
+_POLICY_DETAILS_TEMPLATE = (
+    "Policy Details: {policy_num}\n"
+    "ID: {policy_id}\n"
+    "\n"
+    "Type: {policy_type}\n"
+    "Carrier: {carrier}\n"
+    "Status: {status}\n"
+    "\n"
+    "Effective Date: {eff_date}\n"
+    "Expiration Date: {exp_date}"
+    "{premium_line}"
+)
+
+_CERTIFICATE_ROW_TEMPLATE = (
+    "{i}. {cert_num}\n"
+    "   Holder: {holder}\n"
+    "   Issued: {issue_date}\n"
+    "   Expires: {exp_date}\n"
+    "   Status: {status}\n"
+)
+
+
+def _iso_day(record: dict, key: str, default: str = "N/A") -> str:
+    """The YYYY-MM-DD part of an ISO timestamp field, or default if it's empty."""
+    value = record.get(key)
+    return value[:10] if value else default
+
+
+def _format_insured_row(i: int, insured: dict) -> str:
+    """One search result row; joined with "\n" this leaves a blank line after it."""
+    name = insured.get("commercialName") or f"{insured.get('firstName', '')} {insured.get('lastName', '')}".strip()
+    email = insured.get("email", "")
+    phone = insured.get("phone", "")
+    location = f"{insured.get('city', '')}, {insured.get('state', '')}".strip(", ")
+
+    return _INSURED_ROW_TEMPLATE.format_map({
+        "i": i,
+        "insured_id": insured.get("id", "unknown"),
+        "name": name or "Unknown",
+        "phone_line": f"   Phone: {phone}\n" if phone else "",
+        "email_line": f"   Email: {email}\n" if email else "",
+        "location_line": f"   Location: {location}\n" if location else "",
+    })
+
+
+def _format_policy_row(i: int, policy: dict) -> str:
+    """One list_policies row; joined with "\n" this leaves a blank line after it."""
+    premium = policy.get("premium", 0)
+
+    return _POLICY_ROW_TEMPLATE.format_map({
+        "i": i,
+        "policy_num": policy.get("policyNumber", "Unknown"),
+        "policy_type": policy.get("policyType", "Unknown"),
+        "status": policy.get("status", "Unknown"),
+        "eff_date": _iso_day(policy, "effectiveDate"),
+        "exp_date": _iso_day(policy, "expirationDate"),
+        "premium_line": f"   Premium: ${premium:,.2f}\n" if premium else "",
+    })
+
+
+def _format_certificate_row(i: int, cert: dict) -> str:
+    """One list_certificates row; joined with "\n" this leaves a blank line after it."""
+    return _CERTIFICATE_ROW_TEMPLATE.format_map({
+        "i": i,
+        "cert_num": cert.get("certificateNumber", "N/A"),
+        "holder": cert.get("holderName", "Unknown"),
+        "issue_date": _iso_day(cert, "issueDate"),
+        "exp_date": _iso_day(cert, "expirationDate"),
+        "status": cert.get("status", "Unknown"),
+    })
+
+
+def _response_dict(response: httpx.Response) -> dict:
+    """Parsed JSON body, or {"error": ..., "status": code} for 4xx/5xx responses."""
+    if response.status_code >= 400:
+        return {
+            "error": f"NowCerts API error {response.status_code}: {response.text[:500]}",
+            "status": response.status_code,
+        }
+    return orjson.loads(response.content)
+
+
+def _render_insured_details(insured_id: str, result: dict) -> str:
+    """get_insured_details output for an InsuredList({id}) result."""
+    if "error" in result:
+        return f"Error fetching insured: {result['error']}"
+
+    name = result.get("commercialName") or f"{result.get('firstName', '')} {result.get('lastName', '')}".strip()
+
+    output = [f"Insured Details: {name}", f"ID: {insured_id}", ""]
+
+    # Contact info
+    if result.get("email"):
+        output.append(f"Email: {result['email']}")
+    if result.get("phone"):
+        output.append(f"Phone: {result['phone']}")
+
+    # Address
+    addr_parts = [
+        result.get("addressLine1", ""),
+        result.get("city", ""),
+        result.get("state", ""),
+        result.get("zipCode", ""),
+    ]
+    addr = ", ".join(p for p in addr_parts if p)
+    if addr:
+        output.append(f"Address: {addr}")
+
+    # Additional details
+    if result.get("dateOfBirth"):
+        output.append(f"DOB: {result['dateOfBirth'][:10]}")
+    if result.get("licenseNumber"):
+        output.append(f"License: {result['licenseNumber']}")
+
+    return "\n".join(output)
+
+
+def _policies_query(insured_id: str) -> tuple[str, dict]:
+    """Endpoint and params for an insured's policies (list_policies)."""
+    return "/api/PolicyList()", {
+        "$filter": f"insuredId eq '{insured_id}'",
+        "$select": "id,policyNumber,policyType,effectiveDate,expirationDate,status,premium",
+        "$top": "50",
+        "$orderby": "expirationDate desc",
+    }
+
+
+def _render_policies(insured_id: str, result: dict) -> str:
+    """list_policies output for a _policies_query() result."""
+    if "error" in result:
+        return f"Error fetching policies: {result['error']}"
+
+    policies = result.get("value", [])
+    if not policies:
+        return f"No policies found for insured {insured_id}"
+
+    rows = "\n".join(_format_policy_row(i, policy) for i, policy in enumerate(policies, 1))
+    return (
+        f"Policies for Insured {insured_id}:\n\n"
+        f"{rows}\n"
+        f"Total: {len(policies)} policy(ies)"
+    )
+
+
+def _certificates_query(insured_id: str, active_only: bool) -> tuple[str, dict]:
+    """Endpoint and params for an insured's certificates (list_certificates)."""
+    params = {
+        "$filter": f"insuredId eq '{insured_id}'",
+        "$select": "id,certificateNumber,holderName,issueDate,expirationDate,status",
+        "$top": "50",
+        "$orderby": "issueDate desc",
+    }
+
+    if active_only:
+        params["$filter"] += " and status eq 'Active'"
+
+    return "/api/CertificateList()", params
+
+
+def _render_certificates(insured_id: str, active_only: bool, result: dict) -> str:
+    """list_certificates output for a _certificates_query() result."""
+    if "error" in result:
+        return f"Error fetching certificates: {result['error']}"
+
+    certs = result.get("value", [])
+    filter_text = "Active" if active_only else "All"
+
+    if not certs:
+        return f"No {filter_text.lower()} certificates found for insured {insured_id}"
+
+    rows = "\n".join(_format_certificate_row(i, cert) for i, cert in enumerate(certs, 1))
+    return (
+        f"{filter_text} Certificates for {insured_id}:\n\n"
+        f"{rows}\n"
+        f"Total: {len(certs)} {filter_text.lower()} certificate(s)"
+    )
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a gateway error."""
+    try:
+        delay = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        delay = _RETRY_DELAY * 2**attempt
+    return min(max(delay, 0.0), _MAX_RETRY_DELAY)
+
+
+def _odata_str(value: str) -> str:
+    """Escape a value for use inside an OData string literal."""
+    return value.replace("'", "''")
+
+
+def _rejects_contains(result: dict) -> bool:
+    """
+    Whether an error result says the API doesn't support contains().
+
+    A 400 can also mean a bad value in this one query, which says nothing
+    about later searches; only one naming the function counts.
+    """
+    if result.get("status") == 501:
+        return True
+    text = str(result.get("error", "")).lower()
+    return result.get("status") == 400 and "contains" in text and ("function" in text or "support" in text)
 
 
 class NowCertsTools(Toolkit):
@@ -34,27 +314,90 @@ class NowCertsTools(Toolkit):
             access_token: Pre-existing access token (uses NOWCERTS_ACCESS_TOKEN if not provided)
             refresh_token: Pre-existing refresh token (uses NOWCERTS_REFRESH_TOKEN if not provided)
         """
-        super().__init__(name="nowcerts")
+        super().__init__(
+            name="nowcerts",
+            tools=[
+                self.search_insured,
+                self.search_by_dot,
+                self.get_insured_details,
+                self.list_policies,
+                self.get_policy_details,
+                self.list_certificates,
+                self.get_expiring_policies,
+                self.get_insured_overview,
+            ],
+        )
 
         self.username = username or os.getenv("NOWCERTS_USERNAME")
         self.password = password or os.getenv("NOWCERTS_PASSWORD")
         self.access_token = access_token or os.getenv("NOWCERTS_ACCESS_TOKEN")
         self.refresh_token = refresh_token or os.getenv("NOWCERTS_REFRESH_TOKEN")
         self.token_expires_at = 0
+        # Whether this NowCerts API accepts contains() in $filter (None = unknown)
+        self._supports_contains: Optional[bool] = None
+        # InsuredList field names containing "dot", learned from the first scan
+        self._dot_fields: Optional[tuple[str, ...]] = None
+        # (fetched at, result) of the last successful _insured_page()
+        self._insured_page_cache: Optional[tuple[float, dict]] = None
+        self._token_key = hashlib.sha256(f"{self.username or ''}|{_CLIENT_ID}".encode()).hexdigest()
         self.base_url = "https://api.nowcerts.com"
         self.identity_url = "https://identity.nowcerts.com"
 
-        # Register tools explicitly
-        self.register(self.search_insured)
-        self.register(self.search_by_dot)
-        self.register(self.get_insured_details)
-        self.register(self.list_policies)
-        self.register(self.get_policy_details)
-        self.register(self.list_certificates)
-        self.register(self.get_expiring_policies)
+        # Long-lived clients so calls reuse pooled (HTTP/2) connections instead
+        # of paying a TCP+TLS handshake per request
+        self._api_client = httpx.Client(
+            base_url=self.base_url,
+            http2=True,
+            limits=_LIMITS,
+            timeout=30.0,
+            headers=_API_HEADERS,
+        )
+        self._auth_client = httpx.Client(
+            base_url=self.identity_url,
+            http2=True,
+            limits=_LIMITS,
+            timeout=30.0,
+        )
+
+    def close(self) -> None:
+        """Close the pooled HTTP clients."""
+        self._api_client.close()
+        self._auth_client.close()
 
     def _get_valid_token(self) -> Optional[str]:
-        """Get a valid access token, refreshing if needed."""
+        """
+        Get a valid access token, refreshing if needed.
+
+        Checks the shared _TOKEN_CACHE first. A token request runs under the
+        lock, so concurrent callers wait for one refresh instead of each
+        starting their own.
+        """
+        with _TOKEN_LOCK:
+            cached = _TOKEN_CACHE.get(self._token_key)
+            if cached is not None and cached[0] and cached[2] > time.time() + 300:
+                self.access_token, self.refresh_token, self.token_expires_at = cached
+                return self.access_token
+            if cached is not None and cached[1]:
+                # Expiring soon: refresh with the shared (newest) refresh token
+                self.refresh_token = cached[1]
+
+            token = self._request_token()
+            if token:
+                _TOKEN_CACHE[self._token_key] = (self.access_token, self.refresh_token, self.token_expires_at)
+            return token
+
+    def _invalidate_token(self, token: str) -> None:
+        """Forget an access token the API rejected, here and in _TOKEN_CACHE."""
+        with _TOKEN_LOCK:
+            cached = _TOKEN_CACHE.get(self._token_key)
+            if cached is not None and cached[0] == token:
+                _TOKEN_CACHE[self._token_key] = (None, cached[1], 0)
+            if self.access_token == token:
+                self.access_token = None
+                self.token_expires_at = 0
+
+    def _request_token(self) -> Optional[str]:
+        """Token from this instance's credentials, hitting the identity server if needed."""
         # If we have a token and haven't tracked expiry yet, try it first
         if self.access_token and self.token_expires_at == 0:
             # First use - assume token is valid, set expiry to 1 hour from now
@@ -68,85 +411,271 @@ class NowCertsTools(Toolkit):
         # Try to refresh token
         if self.refresh_token:
             try:
-                with httpx.Client(timeout=30.0) as client:
-                    response = client.post(
-                        f"{self.identity_url}/connect/token",
-                        headers={"Content-Type": "application/x-www-form-urlencoded"},
-                        data={
-                            "grant_type": "refresh_token",
-                            "refresh_token": self.refresh_token,
-                            "client_id": "nowcerts_public_api",
-                        },
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.access_token = data.get("access_token")
-                        self.refresh_token = data.get("refresh_token", self.refresh_token)
-                        expires_in = data.get("expires_in", 3600)
-                        self.token_expires_at = time.time() + expires_in
-                        return self.access_token
-            except Exception as e:
-                print(f"[NowCerts] Token refresh failed: {e}")
+                response = self._auth_client.post(
+                    "/connect/token",
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    data={
+                        "grant_type": "refresh_token",
+                        "refresh_token": self.refresh_token,
+                        "client_id": _CLIENT_ID,
+                    },
+                )
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self.access_token = data.get("access_token")
+                    self.refresh_token = data.get("refresh_token", self.refresh_token)
+                    expires_in = data.get("expires_in", 3600)
+                    self.token_expires_at = time.time() + expires_in
+                    return self.access_token
+            except (httpx.HTTPError, ValueError):
+                log.warning("NowCerts token refresh failed", exc_info=True)
 
         # Try username/password auth
         if self.username and self.password:
             try:
-                with httpx.Client(timeout=30.0) as client:
-                    response = client.post(
-                        f"{self.identity_url}/connect/token",
-                        headers={"Content-Type": "application/x-www-form-urlencoded"},
-                        data={
-                            "grant_type": "password",
-                            "username": self.username,
-                            "password": self.password,
-                            "client_id": "nowcerts_public_api",
-                            "scope": "public_api offline_access",
-                        },
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.access_token = data.get("access_token")
-                        self.refresh_token = data.get("refresh_token")
-                        expires_in = data.get("expires_in", 3600)
-                        self.token_expires_at = time.time() + expires_in
-                        return self.access_token
-            except Exception as e:
-                print(f"[NowCerts] Password auth failed: {e}")
+                response = self._auth_client.post(
+                    "/connect/token",
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    data={
+                        "grant_type": "password",
+                        "username": self.username,
+                        "password": self.password,
+                        "client_id": _CLIENT_ID,
+                        "scope": "public_api offline_access",
+                    },
+                )
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self.access_token = data.get("access_token")
+                    self.refresh_token = data.get("refresh_token")
+                    expires_in = data.get("expires_in", 3600)
+                    self.token_expires_at = time.time() + expires_in
+                    return self.access_token
+            except (httpx.HTTPError, ValueError):
+                log.warning("NowCerts password auth failed", exc_info=True)
 
         return None
 
     def _make_request(
         self, method: str, endpoint: str, params: Optional[dict] = None, json_data: Optional[dict] = None
     ) -> dict:
-        """Make authenticated request to NowCerts API."""
-        token = self._get_valid_token()
-        if not token:
-            return {"error": "NowCerts authentication failed. Check credentials."}
+        """
+        Make authenticated request to NowCerts API.
+
+        A 401 gets one retry with a fresh token, and GETs that hit a gateway
+        error (502/503/504) are retried with backoff, so transient failures
+        don't cost the agent a turn.
+        """
+        if method not in ("GET", "POST"):
+            return {"error": f"Unsupported method: {method}"}
 
-        url = f"{self.base_url}{endpoint}"
+        for attempt in range(_MAX_ATTEMPTS):
+            token = self._get_valid_token()
+            if not token:
+                return {"error": "NowCerts authentication failed. Check credentials."}
 
-        try:
-            with httpx.Client(timeout=30.0) as client:
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                }
+            headers = {"Authorization": f"Bearer {token}"}
 
+            try:
                 if method == "GET":
-                    response = client.get(url, headers=headers, params=params)
-                elif method == "POST":
-                    response = client.post(url, headers=headers, json=json_data)
+                    response = self._api_client.get(endpoint, headers=headers, params=params)
                 else:
-                    return {"error": f"Unsupported method: {method}"}
+                    response = self._api_client.post(endpoint, headers=headers, json=json_data)
+            except httpx.TimeoutException:
+                return {"error": "NowCerts request timed out"}
+            except Exception as e:
+                return {"error": f"NowCerts request failed: {str(e)}"}
 
-                if response.status_code >= 400:
-                    return {"error": f"NowCerts API error {response.status_code}: {response.text[:500]}"}
+            last_attempt = attempt == _MAX_ATTEMPTS - 1
+            if response.status_code == 401 and attempt == 0:
+                self._invalidate_token(token)
+                continue
+            # POSTs aren't retried: the server may have acted before failing
+            if response.status_code in _RETRY_STATUSES and method == "GET" and not last_attempt:
+                time.sleep(_retry_delay(response, attempt))
+                continue
 
-                return response.json()
-        except httpx.TimeoutException:
-            return {"error": "NowCerts request timed out"}
-        except Exception as e:
-            return {"error": f"NowCerts request failed: {str(e)}"}
+            try:
+                return _response_dict(response)
+            except Exception as e:
+                return {"error": f"NowCerts request failed: {str(e)}"}
+
+    def _filtered_request(self, endpoint: str, params: dict) -> Optional[dict]:
+        """
+        GET with a server-side contains() $filter.
+
+        Returns None when the API rejects the query (400/501), so the caller
+        falls back to the client-side scan. If the rejection is of contains()
+        itself, that answer is remembered and later searches go straight to
+        the scan.
+        """
+        if self._supports_contains is False:
+            return None
+        return self._check_filtered(self._make_request("GET", endpoint, params=params))
+
+    def _check_filtered(self, result: dict) -> Optional[dict]:
+        """_filtered_request()'s handling of a contains() response."""
+        if result.get("status") in (400, 501):
+            if _rejects_contains(result):
+                self._supports_contains = False
+            return None
+        if "error" not in result:
+            self._supports_contains = True
+        return result
+
+    def _cached_insured_page(self) -> Optional[dict]:
+        """The first InsuredList page, if fetched within _INSURED_PAGE_TTL."""
+        cached = self._insured_page_cache
+        if cached is not None and time.monotonic() - cached[0] < _INSURED_PAGE_TTL:
+            return cached[1]
+        return None
+
+    def _store_insured_page(self, result: dict) -> None:
+        if "error" not in result:
+            self._insured_page_cache = (time.monotonic(), result)
+
+    def _insured_page(self) -> dict:
+        result = self._cached_insured_page()
+        if result is None:
+            result = self._make_request("GET", "/api/InsuredList()", params=_INSURED_PAGE_PARAMS)
+            self._store_insured_page(result)
+        return result
+
+    def _scan_insureds(self, query: str) -> dict:
+        """Client-side name/phone/email match over the first InsuredList page."""
+        result = self._insured_page()
+        if "error" in result:
+            return result
+
+        query_lower = query.lower()
+        filtered = []
+        for ins in result.get("value", []):
+            name = (ins.get("commercialName") or f"{ins.get('firstName', '')} {ins.get('lastName', '')}").lower()
+            phone = (ins.get("phone") or "").lower()
+            email = (ins.get("email") or "").lower()
+            if query_lower in name or query_lower in phone or query_lower in email:
+                filtered.append(ins)
+        return {"value": filtered[:20]}  # Limit to 20 results
+
+    def _scan_for_dot(self, dot_number: str) -> dict:
+        """Client-side DOT match (name or any *dot* field) over the first InsuredList page."""
+        result = self._insured_page()
+        if "error" in result:
+            return result
+
+        insureds = result.get("value", [])
+        if insureds and self._dot_fields is None:
+            # NowCerts may store DOT in different custom field names. The
+            # InsuredList schema doesn't change between calls, so collect them
+            # from the first page once rather than lowercasing every key of
+            # every row on each search.
+            self._dot_fields = tuple({key for ins in insureds for key in ins if "dot" in key.lower()})
+        dot_fields = self._dot_fields or ()
+
+        matches = []
+        for ins in insureds:
+            # Check if DOT appears in name (common pattern: "Company Name - DOT 123456")
+            name = ins.get("commercialName", "") or ""
+            if dot_number in name:
+                matches.append(ins)
+                continue
+
+            # Check custom fields for DOT
+            if any(str(ins.get(key)) == dot_number for key in dot_fields):
+                matches.append(ins)
+        return {"value": matches}
+
+    def _get_many(self, requests: list[tuple[str, dict]]) -> list[dict]:
+        """
+        GET several endpoints concurrently.
+
+        Results come back in request order, each a _make_request() result,
+        so every request gets the same 401 re-auth and gateway retries as a
+        single call, over the same pooled connection.
+        """
+        futures = [
+            _FANOUT_POOL.submit(contextvars.copy_context().run, self._make_request, "GET", endpoint, params)
+            for endpoint, params in requests
+        ]
+        return [future.result() for future in futures]
+
+    def _get_pages(self, endpoint: str, params: dict, stop=None) -> dict:
+        """
+        Fetch an OData list page by page ($top/$skip).
+
+        The first page is a normal request; if it is full, the following
+        pages are requested _PAGE_FANOUT at a time. Paging ends at the first
+        short page, once stop(last_row_of_page) is true, or after _MAX_PAGES.
+
+        Returns:
+            {"value": rows} or the first {"error": ...} encountered
+        """
+        result = self._make_request("GET", endpoint, params={**params, "$top": str(_PAGE_SIZE), "$skip": "0"})
+        if "error" in result:
+            return result
+
+        rows = result.get("value", [])
+        done = len(rows) < _PAGE_SIZE or (stop is not None and rows and stop(rows[-1]))
+        skip = _PAGE_SIZE
+
+        while not done and skip < _PAGE_SIZE * _MAX_PAGES:
+            skips = range(skip, min(skip + _PAGE_SIZE * _PAGE_FANOUT, _PAGE_SIZE * _MAX_PAGES), _PAGE_SIZE)
+            pages = self._get_many([
+                (endpoint, {**params, "$top": str(_PAGE_SIZE), "$skip": str(s)}) for s in skips
+            ])
+            for page in pages:
+                if "error" in page:
+                    return page
+                page_rows = page.get("value", [])
+                rows.extend(page_rows)
+                if len(page_rows) < _PAGE_SIZE or (stop is not None and page_rows and stop(page_rows[-1])):
+                    done = True
+                    break
+            skip = skips[-1] + _PAGE_SIZE
+
+        return {"value": rows}
+
+    def _fetch_expiring(self, start: datetime, end: datetime) -> dict:
+        """
+        Policies whose expiration falls roughly within [start, end].
+
+        Preferred path: a server-side date $filter with $count=true and $top=0
+        to learn the size of the window, then every page of it in one
+        concurrent round, trimmed to _EXPIRING_SELECT. The filter is widened
+        by a day on each side to absorb time zones - callers still apply the
+        exact window. If the API rejects the query or omits the count, falls
+        back to paging the full list (sorted by expiration, all fields) until
+        a page runs past the window.
+        """
+        base = {
+            "$filter": (
+                f"expirationDate ge {(start - timedelta(days=1)):%Y-%m-%d}T00:00:00Z"
+                f" and expirationDate le {(end + timedelta(days=1)):%Y-%m-%d}T23:59:59Z"
+            ),
+            "$orderby": "expirationDate asc",
+            "$select": _EXPIRING_SELECT,
+        }
+        head = self._make_request("GET", "/api/PolicyList()", params={**base, "$top": "0", "$count": "true"})
+        count = head.get("@odata.count")
+
+        if "error" in head or not isinstance(count, int):
+            window_end = end.isoformat(timespec="seconds")
+            return self._get_pages(
+                "/api/PolicyList()",
+                {"$orderby": "expirationDate asc"},
+                stop=lambda policy: (policy.get("expirationDate") or "")[:19] > window_end,
+            )
+
+        skips = range(0, min(count, _PAGE_SIZE * _MAX_PAGES), _PAGE_SIZE)
+        pages = self._get_many([
+            ("/api/PolicyList()", {**base, "$top": str(_PAGE_SIZE), "$skip": str(skip)}) for skip in skips
+        ])
+        rows = []
+        for page in pages:
+            if "error" in page:
+                return page
+            rows.extend(page.get("value", []))
+        return {"value": rows}
 
     @observe_tool
     def search_insured(self, query: str, search_type: str = "name") -> str:
@@ -163,27 +692,23 @@ class NowCertsTools(Toolkit):
         if not query:
             return "Error: search query is required"
 
-        # NowCerts requires $top, $skip, $orderby for InsuredList
-        # Use client-side filtering for flexibility
-        params = {
-            "$top": "500",
+        # Let NowCerts do the matching ("first last" covers full-name
+        # queries); fall back to scanning a page client-side if this API
+        # doesn't support contains() or finds nothing
+        q = _odata_str(query.lower())
+        result = self._filtered_request("/api/InsuredList()", {
+            "$filter": (
+                f"contains(tolower(commercialName),'{q}') or contains(tolower(firstName),'{q}')"
+                f" or contains(tolower(lastName),'{q}')"
+                f" or contains(tolower(concat(concat(firstName,' '),lastName)),'{q}')"
+                f" or contains(tolower(email),'{q}') or contains(phone,'{q}')"
+            ),
+            "$top": "20",
             "$skip": "0",
             "$orderby": "commercialName",
-        }
-
-        result = self._make_request("GET", "/api/InsuredList()", params=params)
-
-        # Client-side filter since OData contains() may not work
-        if "value" in result:
-            query_lower = query.lower()
-            filtered = []
-            for ins in result.get("value", []):
-                name = (ins.get("commercialName") or f"{ins.get('firstName', '')} {ins.get('lastName', '')}").lower()
-                phone = (ins.get("phone") or "").lower()
-                email = (ins.get("email") or "").lower()
-                if query_lower in name or query_lower in phone or query_lower in email:
-                    filtered.append(ins)
-            result["value"] = filtered[:20]  # Limit to 20 results
+        })
+        if result is None or ("error" not in result and not result.get("value")):
+            result = self._scan_insureds(query)
 
         if "error" in result:
             return f"Error searching NowCerts: {result['error']}"
@@ -192,27 +717,12 @@ class NowCertsTools(Toolkit):
         if not insureds:
             return f'No insureds found matching "{query}" ({search_type})'
 
-        output = [f'NowCerts Search Results ({search_type}: "{query}"):\n']
-
-        for i, insured in enumerate(insureds, 1):
-            insured_id = insured.get("id", "unknown")
-            name = insured.get("commercialName") or f"{insured.get('firstName', '')} {insured.get('lastName', '')}".strip()
-            email = insured.get("email", "")
-            phone = insured.get("phone", "")
-            location = f"{insured.get('city', '')}, {insured.get('state', '')}".strip(", ")
-
-            output.append(f"{i}. Insured ID: {insured_id}")
-            output.append(f"   Name: {name or 'Unknown'}")
-            if phone:
-                output.append(f"   Phone: {phone}")
-            if email:
-                output.append(f"   Email: {email}")
-            if location:
-                output.append(f"   Location: {location}")
-            output.append("")
-
-        output.append(f"Found {len(insureds)} insured(s) matching your search.")
-        return "\n".join(output)
+        rows = "\n".join(_format_insured_row(i, insured) for i, insured in enumerate(insureds, 1))
+        return (
+            f'NowCerts Search Results ({search_type}: "{query}"):\n\n'
+            f"{rows}\n"
+            f"Found {len(insureds)} insured(s) matching your search."
+        )
 
     @observe_tool
     def search_by_dot(self, dot_number: str) -> str:
@@ -227,66 +737,63 @@ class NowCertsTools(Toolkit):
         Returns:
             str: Matching insured(s) with policy summary
         """
+        return self.search_by_dot_raw(dot_number).text
+
+    def search_by_dot_raw(self, dot_number: str) -> LookupResult:
+        """
+        search_by_dot as a LookupResult, for workflows.
+
+        When found, fields holds insured_id of the first match.
+        """
         if not dot_number:
-            return "Error: DOT number is required"
+            return LookupResult("Error: DOT number is required", status="error")
 
         dot_number = dot_number.strip()
 
-        # Fetch all insureds and filter client-side for DOT
-        params = {
+        # Common pattern is "Company Name - DOT 123456", which the server can
+        # match across every insured. DOTs kept in custom fields can't be
+        # filtered generically, so the client-side scan's matches are merged
+        # in (or used alone without contains() support). Without a recent
+        # scan page, the filter and the page are fetched together.
+        filter_params = {
+            "$filter": f"contains(commercialName,'{_odata_str(dot_number)}')",
             "$top": "500",
             "$skip": "0",
             "$orderby": "commercialName",
         }
-
-        result = self._make_request("GET", "/api/InsuredList()", params=params)
+        if self._supports_contains is not False and self._cached_insured_page() is None:
+            filtered, page = self._get_many([
+                ("/api/InsuredList()", filter_params),
+                ("/api/InsuredList()", _INSURED_PAGE_PARAMS),
+            ])
+            self._store_insured_page(page)
+            result = self._check_filtered(filtered)
+        else:
+            result = self._filtered_request("/api/InsuredList()", filter_params)
+        scan = self._scan_for_dot(dot_number)
+        if result is None or "error" in result:
+            result = scan
+        elif "error" not in scan:
+            matches = result.get("value", [])
+            seen = {ins.get("id") for ins in matches}
+            result = {"value": matches + [ins for ins in scan["value"] if ins.get("id") not in seen]}
 
         if "error" in result:
-            return f"Error searching NowCerts: {result['error']}"
-
-        # Filter for DOT match in commercial name or custom fields
-        insureds = result.get("value", [])
-        matches = []
-
-        for ins in insureds:
-            # Check if DOT appears in name (common pattern: "Company Name - DOT 123456")
-            name = ins.get("commercialName", "") or ""
-            if dot_number in name:
-                matches.append(ins)
-                continue
+            return LookupResult(f"Error searching NowCerts: {result['error']}", status="error")
 
-            # Check custom fields for DOT
-            # NowCerts may store DOT in different custom field names
-            for key, value in ins.items():
-                if "dot" in key.lower() and str(value) == dot_number:
-                    matches.append(ins)
-                    break
+        matches = result.get("value", [])
 
         if not matches:
-            return f"No insured found with DOT {dot_number} in NowCerts"
-
-        output = [f"NowCerts Search - DOT {dot_number}:\n"]
-
-        for i, insured in enumerate(matches, 1):
-            insured_id = insured.get("id", "unknown")
-            name = insured.get("commercialName") or f"{insured.get('firstName', '')} {insured.get('lastName', '')}".strip()
-            email = insured.get("email", "")
-            phone = insured.get("phone", "")
-            location = f"{insured.get('city', '')}, {insured.get('state', '')}".strip(", ")
-
-            output.append(f"{i}. Insured ID: {insured_id}")
-            output.append(f"   Name: {name or 'Unknown'}")
-            if phone:
-                output.append(f"   Phone: {phone}")
-            if email:
-                output.append(f"   Email: {email}")
-            if location:
-                output.append(f"   Location: {location}")
-            output.append("")
+            return LookupResult(f"No insured found with DOT {dot_number} in NowCerts")
 
-        output.append(f"Found {len(matches)} insured(s) with DOT {dot_number}")
-        output.append("Use list_policies(insured_id) for policy details.")
-        return "\n".join(output)
+        rows = "\n".join(_format_insured_row(i, insured) for i, insured in enumerate(matches, 1))
+        text = (
+            f"NowCerts Search - DOT {dot_number}:\n\n"
+            f"{rows}\n"
+            f"Found {len(matches)} insured(s) with DOT {dot_number}\n"
+            "Use list_policies(insured_id) for policy details."
+        )
+        return LookupResult(text, status="found", fields={"insured_id": matches[0].get("id", "unknown")})
 
     @observe_tool
     def get_expiring_policies(self, days_out: int = 30) -> str:
@@ -301,6 +808,15 @@ class NowCertsTools(Toolkit):
         Returns:
             str: List of expiring policies with insured info and dates
         """
+        return self.get_expiring_policies_raw(days_out).text
+
+    def get_expiring_policies_raw(self, days_out: int = 30) -> LookupResult:
+        """
+        get_expiring_policies as a LookupResult, for workflows.
+
+        "found" when any policy expires in the window; rows holds the listed
+        PolicyList records (insuredName, expirationDate, ...).
+        """
         if days_out < 1:
             days_out = 30
         if days_out > 90:
@@ -310,48 +826,45 @@ class NowCertsTools(Toolkit):
         today = datetime.now()
         future_date = today + timedelta(days=days_out)
 
-        # Fetch policies (OData filter may not work, use client-side)
-        params = {
-            "$top": "500",
-            "$orderby": "expirationDate asc",
-        }
-
-        result = self._make_request("GET", "/api/PolicyList()", params=params)
+        result = self._fetch_expiring(today, future_date)
 
         if "error" in result:
-            return f"Error fetching policies: {result['error']}"
+            return LookupResult(f"Error fetching policies: {result['error']}", status="error")
 
         policies = result.get("value", [])
 
-        # Filter client-side for expiration date within range
+        # Filter client-side for expiration date within range. ISO-8601
+        # timestamps sort chronologically as strings, so the window check is
+        # a string comparison on "YYYY-MM-DDTHH:MM:SS" (offset dropped); only
+        # rows inside the window are parsed.
+        window_start = today.isoformat(timespec="seconds")
+        window_end = future_date.isoformat(timespec="seconds")
         expiring = []
         for policy in policies:
-            exp_str = policy.get("expirationDate", "")
-            if not exp_str:
+            exp_key = (policy.get("expirationDate") or "")[:19]
+            if not exp_key or not (window_start <= exp_key <= window_end):
                 continue
 
             try:
-                # Parse ISO date
-                exp_date = datetime.fromisoformat(exp_str.replace("Z", "+00:00").split("+")[0])
-                if today <= exp_date <= future_date:
-                    policy["_exp_date"] = exp_date
-                    expiring.append(policy)
-            except (ValueError, TypeError):
+                policy["_exp_date"] = datetime.fromisoformat(exp_key)
+            except ValueError:
                 continue
+            expiring.append(policy)
 
         if not expiring:
-            return f"No policies expiring in the next {days_out} days"
+            return LookupResult(f"No policies expiring in the next {days_out} days")
 
         # Sort by expiration date
         expiring.sort(key=lambda p: p.get("_exp_date", today))
 
         output = [f"Policies Expiring in Next {days_out} Days:\n"]
 
-        for i, policy in enumerate(expiring[:25], 1):  # Limit to 25
+        listed = expiring[:25]  # Limit to 25
+        for i, policy in enumerate(listed, 1):
             policy_num = policy.get("policyNumber", "Unknown")
             policy_type = policy.get("policyType", "Unknown")
             insured_name = policy.get("insuredName", "Unknown")
-            exp_date = policy.get("expirationDate", "")[:10]
+            exp_date = _iso_day(policy, "expirationDate", "")
             premium = policy.get("premium", 0)
             days_left = (policy.get("_exp_date") - today).days
 
@@ -367,7 +880,7 @@ class NowCertsTools(Toolkit):
         if total > 25:
             output.append(f"(Showing first 25 of {total})")
 
-        return "\n".join(output)
+        return LookupResult("\n".join(output), status="found", rows=tuple(listed))
 
     @observe_tool
     def get_insured_details(self, insured_id: str) -> str:
@@ -384,38 +897,7 @@ class NowCertsTools(Toolkit):
             return "Error: insured_id is required"
 
         result = self._make_request("GET", f"/api/InsuredList({insured_id})")
-
-        if "error" in result:
-            return f"Error fetching insured: {result['error']}"
-
-        name = result.get("commercialName") or f"{result.get('firstName', '')} {result.get('lastName', '')}".strip()
-
-        output = [f"Insured Details: {name}", f"ID: {insured_id}", ""]
-
-        # Contact info
-        if result.get("email"):
-            output.append(f"Email: {result['email']}")
-        if result.get("phone"):
-            output.append(f"Phone: {result['phone']}")
-
-        # Address
-        addr_parts = [
-            result.get("addressLine1", ""),
-            result.get("city", ""),
-            result.get("state", ""),
-            result.get("zipCode", ""),
-        ]
-        addr = ", ".join(p for p in addr_parts if p)
-        if addr:
-            output.append(f"Address: {addr}")
-
-        # Additional details
-        if result.get("dateOfBirth"):
-            output.append(f"DOB: {result['dateOfBirth'][:10]}")
-        if result.get("licenseNumber"):
-            output.append(f"License: {result['licenseNumber']}")
-
-        return "\n".join(output)
+        return _render_insured_details(insured_id, result)
 
     @observe_tool
     def list_policies(self, insured_id: str) -> str:
@@ -431,42 +913,7 @@ class NowCertsTools(Toolkit):
         if not insured_id:
             return "Error: insured_id is required"
 
-        # Get policies for this insured
-        params = {
-            "$filter": f"insuredId eq '{insured_id}'",
-            "$select": "id,policyNumber,policyType,effectiveDate,expirationDate,status,premium",
-            "$top": "50",
-            "$orderby": "expirationDate desc",
-        }
-
-        result = self._make_request("GET", "/api/PolicyList()", params=params)
-
-        if "error" in result:
-            return f"Error fetching policies: {result['error']}"
-
-        policies = result.get("value", [])
-        if not policies:
-            return f"No policies found for insured {insured_id}"
-
-        output = [f"Policies for Insured {insured_id}:\n"]
-
-        for i, policy in enumerate(policies, 1):
-            policy_num = policy.get("policyNumber", "Unknown")
-            policy_type = policy.get("policyType", "Unknown")
-            status = policy.get("status", "Unknown")
-            eff_date = policy.get("effectiveDate", "")[:10] if policy.get("effectiveDate") else "N/A"
-            exp_date = policy.get("expirationDate", "")[:10] if policy.get("expirationDate") else "N/A"
-            premium = policy.get("premium", 0)
-
-            output.append(f"{i}. {policy_num} - {policy_type}")
-            output.append(f"   Status: {status}")
-            output.append(f"   Effective: {eff_date} to {exp_date}")
-            if premium:
-                output.append(f"   Premium: ${premium:,.2f}")
-            output.append("")
-
-        output.append(f"Total: {len(policies)} policy(ies)")
-        return "\n".join(output)
+        return _render_policies(insured_id, self._make_request("GET", *_policies_query(insured_id)))
 
     @observe_tool
     def get_policy_details(self, policy_id: str) -> str:
@@ -491,24 +938,20 @@ class NowCertsTools(Toolkit):
         policy_type = result.get("policyType", "Unknown")
         status = result.get("status", "Unknown")
         carrier = result.get("carrierName", "Unknown")
-        eff_date = result.get("effectiveDate", "")[:10] if result.get("effectiveDate") else "N/A"
-        exp_date = result.get("expirationDate", "")[:10] if result.get("expirationDate") else "N/A"
+        eff_date = _iso_day(result, "effectiveDate")
+        exp_date = _iso_day(result, "expirationDate")
         premium = result.get("premium", 0)
 
-        output = [
-            f"Policy Details: {policy_num}",
-            f"ID: {policy_id}",
-            "",
-            f"Type: {policy_type}",
-            f"Carrier: {carrier}",
-            f"Status: {status}",
-            "",
-            f"Effective Date: {eff_date}",
-            f"Expiration Date: {exp_date}",
-        ]
-
-        if premium:
-            output.append(f"Premium: ${premium:,.2f}")
+        output = [_POLICY_DETAILS_TEMPLATE.format_map({
+            "policy_num": policy_num,
+            "policy_id": policy_id,
+            "policy_type": policy_type,
+            "carrier": carrier,
+            "status": status,
+            "eff_date": eff_date,
+            "exp_date": exp_date,
+            "premium_line": f"\nPremium: ${premium:,.2f}" if premium else "",
+        })]
 
         # Add coverage limits if available
         if result.get("limits"):
@@ -533,43 +976,39 @@ class NowCertsTools(Toolkit):
         if not insured_id:
             return "Error: insured_id is required"
 
-        params = {
-            "$filter": f"insuredId eq '{insured_id}'",
-            "$select": "id,certificateNumber,holderName,issueDate,expirationDate,status",
-            "$top": "50",
-            "$orderby": "issueDate desc",
-        }
-
-        if active_only:
-            params["$filter"] += " and status eq 'Active'"
+        result = self._make_request("GET", *_certificates_query(insured_id, active_only))
+        return _render_certificates(insured_id, active_only, result)
 
-        result = self._make_request("GET", "/api/CertificateList()", params=params)
-
-        if "error" in result:
-            return f"Error fetching certificates: {result['error']}"
-
-        certs = result.get("value", [])
-        filter_text = "Active" if active_only else "All"
-
-        if not certs:
-            return f"No {filter_text.lower()} certificates found for insured {insured_id}"
+    @observe_tool
+    def get_insured_overview(self, insured_id: str, active_only: bool = True) -> str:
+        """
+        Get an insured's details, policies and certificates in one call.
 
-        output = [f"{filter_text} Certificates for {insured_id}:\n"]
+        Use this instead of calling get_insured_details, list_policies and
+        list_certificates one after another for the same insured.
 
-        for i, cert in enumerate(certs, 1):
-            cert_id = cert.get("id", "unknown")
-            cert_num = cert.get("certificateNumber", "N/A")
-            holder = cert.get("holderName", "Unknown")
-            issue_date = cert.get("issueDate", "")[:10] if cert.get("issueDate") else "N/A"
-            exp_date = cert.get("expirationDate", "")[:10] if cert.get("expirationDate") else "N/A"
-            status = cert.get("status", "Unknown")
+        Args:
+            insured_id: The NowCerts insured ID (GUID)
+            active_only: Only show active certificates (default: True)
 
-            output.append(f"{i}. {cert_num}")
-            output.append(f"   Holder: {holder}")
-            output.append(f"   Issued: {issue_date}")
-            output.append(f"   Expires: {exp_date}")
-            output.append(f"   Status: {status}")
-            output.append("")
+        Returns:
+            str: Insured details, policy list and certificate list
+        """
+        if not insured_id:
+            return "Error: insured_id is required"
 
-        output.append(f"Total: {len(certs)} {filter_text.lower()} certificate(s)")
-        return "\n".join(output)
+        # The three lookups go out together as concurrent streams on the
+        # pooled HTTP/2 connection, so once it is open this costs about one
+        # round trip. Each is a _make_request(), so a 401 re-authenticates
+        # instead of failing the section.
+        details, policies, certs = self._get_many([
+            (f"/api/InsuredList({insured_id})", {}),
+            _policies_query(insured_id),
+            _certificates_query(insured_id, active_only),
+        ])
+
+        return "\n\n".join([
+            _render_insured_details(insured_id, details),
+            _render_policies(insured_id, policies),
+            _render_certificates(insured_id, active_only, certs),
+        ])
@@ -5,25 +5,88 @@ Tools for reading and extracting content from PDF documents.
 Optimized for insurance policy documents and certificates.
 """
 
+import io
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 import fitz  # pymupdf
 from agno.tools.toolkit import Toolkit
 
 from app.observability import observe_tool
 
+# PyMuPDF documents (and MuPDF itself) are not thread-safe; every access to
+# a document goes through this lock.
+_FITZ_LOCK = threading.RLock()
+
+
+@lru_cache(maxsize=64)
+def _resolve(file_path: str, cwd: str) -> Path:
+    """
+    Absolute, symlink-free path for a tool argument.
+
+    resolve() does a readlink per path component, and an agent paging
+    through a document passes the same path on every call. cwd is part of
+    the key because relative paths resolve against it.
+    """
+    return Path(file_path).expanduser().resolve()
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    """Modification time of path, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=16)
+def _open(path_str: str, mtime_ns: int) -> fitz.Document:
+    """
+    Parsed document for a PDF, shared across tool calls.
+
+    Keyed on mtime so an edited file is re-parsed. The document is opened
+    from memory rather than by filename so the cache never holds the file
+    open (which on Windows would block replacing or deleting it).
+    """
+    with open(path_str, "rb") as f:
+        data = f.read()
+    try:
+        return fitz.open(stream=data, filetype="pdf")
+    except fitz.FileDataError as e:
+        # Keep the file name in the message, as opening by path did
+        raise fitz.FileDataError(f"Failed to open file {path_str!r} as type pdf.") from e
+
+
+def _is_image_only(doc: fitz.Document, page_count: int) -> bool:
+    """
+    True if the first page_count pages are a scan with no text layer.
+
+    Scanned certificates are common uploads. Rather than extracting every
+    page to find no text, look at page resources: a page that uses no
+    fonts cannot produce text. Only checked when the first page is an
+    image without fonts, so ordinary text PDFs skip straight to extraction.
+    """
+    if not page_count or doc.get_page_fonts(0) or not doc.get_page_images(0):
+        return False
+    return not any(doc.get_page_fonts(i) for i in range(1, page_count))
+
 
 class PDFTools(Toolkit):
     """Tools for reading PDF documents."""
 
     def __init__(self):
         """Initialize PDF tools."""
-        super().__init__(name="pdf")
-
-        # Register tools explicitly
-        self.register(self.read_pdf)
-        self.register(self.read_pdf_page)
-        self.register(self.get_pdf_info)
+        super().__init__(
+            name="pdf",
+            tools=[
+                self.read_pdf,
+                self.read_pdf_page,
+                self.get_pdf_info,
+            ],
+        )
 
     @observe_tool
     def read_pdf(self, file_path: str, max_pages: int = 50) -> str:
@@ -37,32 +100,40 @@ class PDFTools(Toolkit):
         Returns:
             str: Extracted text content from the PDF
         """
-        path = Path(file_path).expanduser().resolve()
+        path = _resolve(file_path, os.getcwd())
+        mtime_ns = _mtime_ns(path)
 
-        if not path.exists():
+        if mtime_ns is None:
             return f"ERROR: File not found: {file_path}"
 
         if not path.suffix.lower() == ".pdf":
             return f"ERROR: Not a PDF file: {file_path}"
 
         try:
-            doc = fitz.open(str(path))
-            total_pages = len(doc)
-            pages_to_read = min(total_pages, max_pages)
-            text_content = []
-
-            for page_num in range(pages_to_read):
-                page = doc[page_num]
-                text = page.get_text()
-                if text.strip():
-                    text_content.append(f"--- Page {page_num + 1} ---\n{text}")
-
-            doc.close()
-
-            if not text_content:
+            with _FITZ_LOCK:
+                doc = _open(str(path), mtime_ns)
+                total_pages = len(doc)
+                # doc.pages() wraps negative bounds, so clamp at zero
+                pages_to_read = max(0, min(total_pages, max_pages))
+
+                if _is_image_only(doc, pages_to_read):
+                    return f"PDF has {total_pages} pages but no extractable text (may be scanned/image-based)"
+
+                # Write page text straight into one buffer rather than
+                # collecting a list and joining it (a second full copy)
+                buf = io.StringIO()
+                for page in doc.pages(0, pages_to_read):
+                    text = page.get_text()
+                    if text.strip():
+                        if buf.tell():
+                            buf.write("\n\n")
+                        buf.write(f"--- Page {page.number + 1} ---\n")
+                        buf.write(text)
+
+            if not buf.tell():
                 return f"PDF has {total_pages} pages but no extractable text (may be scanned/image-based)"
 
-            result = "\n\n".join(text_content)
+            result = buf.getvalue()
 
             if total_pages > max_pages:
                 result += f"\n\n[INFO: Showing {max_pages} of {total_pages} total pages. Use read_pdf_page for specific pages.]"
@@ -84,22 +155,22 @@ class PDFTools(Toolkit):
         Returns:
             str: Text content from the specified page
         """
-        path = Path(file_path).expanduser().resolve()
+        path = _resolve(file_path, os.getcwd())
+        mtime_ns = _mtime_ns(path)
 
-        if not path.exists():
+        if mtime_ns is None:
             return f"ERROR: File not found: {file_path}"
 
         try:
-            doc = fitz.open(str(path))
-            total_pages = len(doc)
+            with _FITZ_LOCK:
+                doc = _open(str(path), mtime_ns)
+                total_pages = len(doc)
 
-            if page_number < 1 or page_number > total_pages:
-                doc.close()
-                return f"ERROR: Page {page_number} out of range. PDF has {total_pages} pages."
+                if page_number < 1 or page_number > total_pages:
+                    return f"ERROR: Page {page_number} out of range. PDF has {total_pages} pages."
 
-            page = doc[page_number - 1]  # Convert to 0-indexed
-            text = page.get_text()
-            doc.close()
+                page = doc[page_number - 1]  # Convert to 0-indexed
+                text = page.get_text()
 
             if not text.strip():
                 return f"Page {page_number} has no extractable text (may be scanned/image-based)"
@@ -120,18 +191,21 @@ class PDFTools(Toolkit):
         Returns:
             str: PDF metadata including page count, title, author, etc.
         """
-        path = Path(file_path).expanduser().resolve()
+        path = _resolve(file_path, os.getcwd())
+        mtime_ns = _mtime_ns(path)
 
-        if not path.exists():
+        if mtime_ns is None:
             return f"ERROR: File not found: {file_path}"
 
         try:
-            doc = fitz.open(str(path))
-            metadata = doc.metadata
+            with _FITZ_LOCK:
+                doc = _open(str(path), mtime_ns)
+                metadata = doc.metadata
+                page_count = len(doc)
 
             info = [
                 f"File: {path.name}",
-                f"Pages: {len(doc)}",
+                f"Pages: {page_count}",
                 f"Title: {metadata.get('title') or 'N/A'}",
                 f"Author: {metadata.get('author') or 'N/A'}",
                 f"Subject: {metadata.get('subject') or 'N/A'}",
@@ -139,7 +213,6 @@ class PDFTools(Toolkit):
                 f"Creation Date: {metadata.get('creationDate') or 'N/A'}",
             ]
 
-            doc.close()
             return "\n".join(info)
 
         except Exception as e:
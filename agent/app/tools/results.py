@@ -0,0 +1,40 @@
+"""
+Structured lookup results for cross-system workflows.
+
+Workflow tools branch on what a sub-tool found. The *_raw lookups return a
+LookupResult so they can check its status and fields instead of searching
+the formatted text for phrases like "No lead found".
+"""
+
+from dataclasses import dataclass, field
+from typing import Literal
+
+LookupStatus = Literal["found", "missing", "error"]
+
+
+@dataclass(frozen=True)
+class LookupResult:
+    """
+    Outcome of a lookup.
+
+    Attributes:
+        text: Exactly what the corresponding tool returns to the agent
+        status: "found", "missing" (looked up, no such record), or "error"
+            (bad input, auth, API or network failure - so "missing" can't
+            be concluded either)
+        fields: Selected values from the record, when found
+        rows: The records listed in text, for lookups that return several
+    """
+
+    text: str
+    status: LookupStatus = "missing"
+    fields: dict[str, str] = field(default_factory=dict)
+    rows: tuple[dict, ...] = ()
+
+    @property
+    def found(self) -> bool:
+        return self.status == "found"
+
+    @property
+    def error(self) -> bool:
+        return self.status == "error"
@@ -6,13 +6,97 @@ These are the power tools - one command, multiple systems.
 """
 
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from agno.tools.toolkit import Toolkit
 from typing import Optional
 
+from app.concurrency import run_in_background, run_parallel
 from app.observability import observe_tool
 from app.tools.dot_lookup import DOTLookupTools
 from app.tools.close_crm import CloseCRMTools
 from app.tools.nowcerts import NowCertsTools
+from app.tools.results import LookupResult
+
+# carrier_snapshot results are reused for repeat questions about the same DOT
+# within a conversation; FMCSA responses have their own (longer) cache.
+# "Not in Close/NowCerts" answers are kept briefly too, since the agent
+# often re-asks about the same unknown DOT.
+_SNAPSHOT_TTL = 300
+_MISS_TTL = 60
+# The renewal dashboard polls renewal_check; one NowCerts policy scan per
+# window per minute is plenty
+_EXPIRING_TTL = 60
+_CACHE_MAX_ENTRIES = 256
+
+# DOT numbers as they appear in insured names ("Acme Trucking - DOT 123456")
+_DOT_PATTERN = re.compile(r"\bDOT\s*#?:?\s*(\d{5,8})\b", re.IGNORECASE)
+
+# Output skeletons, filled in with one format call each. Sub-tool results can
+# be long (multi-insured NowCerts matches), so they are copied into the
+# response once rather than appended to a list and re-scanned by join().
+_SNAPSHOT_TEMPLATE = (
+    "=== CARRIER SNAPSHOT: DOT {dot_number} ===\n"
+    "\n"
+    "--- FMCSA DATA ---\n"
+    "{fmcsa}\n"
+    "\n"
+    "--- CLOSE CRM ---\n"
+    "{close}\n"
+    "\n"
+    "--- NOWCERTS ---\n"
+    "{nowcerts}\n"
+    "\n"
+    "--- SUMMARY ---\n"
+    "FMCSA: {fmcsa_status}\n"
+    "Close: {close_status}\n"
+    "NowCerts: {nowcerts_status}"
+)
+
+_NEW_PROSPECT_TEMPLATE = (
+    "=== NEW PROSPECT: DOT {dot_number} ===\n"
+    "\n"
+    "FMCSA INFO:\n"
+    "{dot_info}\n"
+    "\n"
+    "{nowcerts_block}"
+    "CLOSE CRM:\n"
+    "{create_result}"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_dot() -> DOTLookupTools:
+    return DOTLookupTools()
+
+
+@lru_cache(maxsize=1)
+def _get_close() -> CloseCRMTools:
+    return CloseCRMTools()
+
+
+@lru_cache(maxsize=1)
+def _get_nowcerts() -> NowCertsTools:
+    return NowCertsTools()
+
+
+def _summary_status(result: LookupResult, found: str, not_found: str) -> str:
+    """carrier_snapshot summary wording for one system."""
+    if result.error:
+        return "Lookup failed"
+    return found if result.found else not_found
+
+
+def _close_status(lead: LookupResult) -> str:
+    """One-line Close status from a get_lead_by_dot_raw() result."""
+    if lead.error:
+        return f"Close lookup failed ({lead.text})"
+    if not lead.found:
+        return "Not in Close"
+    return f"Existing lead - {lead.fields['company']} ({lead.fields['status']})"
 
 
 class WorkflowTools(Toolkit):
@@ -22,16 +106,67 @@ class WorkflowTools(Toolkit):
         """Initialize workflow tools with access to all systems."""
         super().__init__(name="workflows")
 
-        # Initialize sub-tools
-        self.dot = DOTLookupTools()
-        self.close = CloseCRMTools()
-        self.nowcerts = NowCertsTools()
+        # Sub-tools are process-wide, so re-creating WorkflowTools (tests,
+        # per-request agents) reuses their HTTP clients and tokens
+        self.dot = _get_dot()
+        self.close = _get_close()
+        self.nowcerts = _get_nowcerts()
+
+        # "snap:{dot}" -> snapshot text, "miss:{system}:{dot}" -> LookupResult,
+        # "expiring:{days}" -> get_expiring_policies_raw LookupResult; values are (value, expires at), in least-recently-used order
+        self._cache: OrderedDict[str, tuple[object, float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
         # Register workflows
         self.register(self.carrier_snapshot)
         self.register(self.new_prospect)
         self.register(self.renewal_check)
 
+    def invalidate(self, dot_number: str) -> None:
+        """Drop everything cached for a DOT after changing its records."""
+        dot_number = dot_number.strip()
+        with self._cache_lock:
+            for key in (f"snap:{dot_number}", f"miss:close:{dot_number}", f"miss:nowcerts:{dot_number}"):
+                self._cache.pop(key, None)
+
+    def _cache_get(self, key: str):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[0]
+
+    def _cache_put(self, key: str, value, ttl: float) -> None:
+        with self._cache_lock:
+            self._cache[key] = (value, time.monotonic() + ttl)
+            self._cache.move_to_end(key)
+            while len(self._cache) > _CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _lookup_close(self, dot_number: str) -> LookupResult:
+        """get_lead_by_dot_raw, answering repeat misses from the cache."""
+        key = f"miss:close:{dot_number}"
+        result = self._cache_get(key)
+        if result is None:
+            result = self.close.get_lead_by_dot_raw(dot_number)
+            if result.status == "missing":
+                self._cache_put(key, result, _MISS_TTL)
+        return result
+
+    def _lookup_nowcerts(self, dot_number: str) -> LookupResult:
+        """search_by_dot_raw, answering repeat misses from the cache."""
+        key = f"miss:nowcerts:{dot_number}"
+        result = self._cache_get(key)
+        if result is None:
+            result = self.nowcerts.search_by_dot_raw(dot_number)
+            if result.status == "missing":
+                self._cache_put(key, result, _MISS_TTL)
+        return result
+
     @observe_tool
     def carrier_snapshot(self, dot_number: str) -> str:
         """
@@ -49,58 +184,34 @@ class WorkflowTools(Toolkit):
         if not dot_number:
             return "Error: DOT number is required"
 
-        dot_number = dot_number.strip()
-        output = [f"=== CARRIER SNAPSHOT: DOT {dot_number} ===", ""]
-
-        # 1. FMCSA/DOT Data
-        output.append("--- FMCSA DATA ---")
-        dot_info = self.dot.lookup_dot_number(dot_number)
-        if "Error" in dot_info or "Invalid" in dot_info:
-            output.append(f"Not found in FMCSA: {dot_info}")
-        else:
-            output.append(dot_info)
-        output.append("")
-
-        # 2. Close CRM Status
-        output.append("--- CLOSE CRM ---")
-        close_info = self.close.get_lead_by_dot(dot_number)
-        if "No lead found" in close_info:
-            output.append("Not in Close CRM (new prospect)")
-        else:
-            output.append(close_info)
-        output.append("")
+        return self._snapshot(dot_number.strip())
 
-        # 3. NowCerts Policy Status
-        output.append("--- NOWCERTS ---")
-        nowcerts_info = self.nowcerts.search_by_dot(dot_number)
-        if "No insured found" in nowcerts_info:
-            output.append("Not in NowCerts (no policies)")
-        else:
-            output.append(nowcerts_info)
-        output.append("")
+    def _snapshot(self, dot_number: str) -> str:
+        """carrier_snapshot for a stripped DOT, without the tool span."""
+        cached = self._cache_get(f"snap:{dot_number}")
+        if cached is not None:
+            return cached
 
-        # Summary
-        output.append("--- SUMMARY ---")
-        in_close = "No lead found" not in close_info
-        in_nowcerts = "No insured found" not in nowcerts_info
-        in_fmcsa = "Error" not in dot_info and "Invalid" not in dot_info and "No carrier" not in dot_info
-
-        if in_fmcsa:
-            output.append("FMCSA: Found")
-        else:
-            output.append("FMCSA: Not found")
-
-        if in_close:
-            output.append("Close: Existing lead")
-        else:
-            output.append("Close: New prospect")
+        # The three systems are independent, so query them together
+        dot, close, nowcerts = run_parallel(
+            lambda: self.dot.lookup_dot_number_raw(dot_number),
+            lambda: self._lookup_close(dot_number),
+            lambda: self._lookup_nowcerts(dot_number),
+        )
 
-        if in_nowcerts:
-            output.append("NowCerts: Has policies")
-        else:
-            output.append("NowCerts: No policies")
-
-        return "\n".join(output)
+        snapshot = _SNAPSHOT_TEMPLATE.format_map({
+            "dot_number": dot_number,
+            "fmcsa": f"Not found in FMCSA: {dot.text}" if dot.error else dot.text,
+            "close": close.text if close.found or close.error else "Not in Close CRM (new prospect)",
+            "nowcerts": nowcerts.text if nowcerts.found or nowcerts.error else "Not in NowCerts (no policies)",
+            "fmcsa_status": _summary_status(dot, "Found", "Not found"),
+            "close_status": _summary_status(close, "Existing lead", "New prospect"),
+            "nowcerts_status": _summary_status(nowcerts, "Has policies", "No policies"),
+        })
+        # Don't pin a failed lookup (timeout, outage) for the whole TTL
+        if not (dot.error or close.error or nowcerts.error):
+            self._cache_put(f"snap:{dot_number}", snapshot, _SNAPSHOT_TTL)
+        return snapshot
 
     @observe_tool
     def new_prospect(
@@ -125,42 +236,39 @@ class WorkflowTools(Toolkit):
             return "Error: DOT number is required"
 
         dot_number = dot_number.strip()
-        output = [f"=== NEW PROSPECT: DOT {dot_number} ===", ""]
-
-        # 1. Check if already in Close
-        close_check = self.close.get_lead_by_dot(dot_number)
-        if "No lead found" not in close_check:
-            output.append("ALREADY IN CLOSE:")
-            output.append(close_check)
-            output.append("")
-            output.append("Lead already exists - no new lead created.")
-            return "\n".join(output)
+        # 1. Check if already in Close. This guards a write, so it always asks
+        # Close: a cached miss could predate a lead created since
+        close_check = self.close.get_lead_by_dot_raw(dot_number)
+        if close_check.error:
+            # Can't rule out a duplicate lead
+            return f"Cannot create prospect: {close_check.text}"
+        if close_check.found:
+            return (
+                f"=== NEW PROSPECT: DOT {dot_number} ===\n"
+                "\n"
+                "ALREADY IN CLOSE:\n"
+                f"{close_check.text}\n"
+                "\n"
+                "Lead already exists - no new lead created."
+            )
+
+        # 2. Get DOT info from FMCSA and 3. check NowCerts for an existing
+        # customer - independent, so both run at once
+        dot, nowcerts = run_parallel(
+            lambda: self.dot.lookup_dot_number_raw(dot_number),
+            lambda: self._lookup_nowcerts(dot_number),
+        )
+        if not dot.found:
+            return f"Cannot create prospect: {dot.text}"
 
-        # 2. Get DOT info from FMCSA
-        dot_info = self.dot.lookup_dot_number(dot_number)
-        if "Error" in dot_info or "Invalid" in dot_info or "No carrier" in dot_info:
-            return f"Cannot create prospect: {dot_info}"
-
-        # Parse DOT info for lead creation
-        lines = dot_info.split("\n")
-        company_name = ""
-        phone = ""
-        address = ""
-
-        for line in lines:
-            if line.startswith("Legal Name:"):
-                company_name = line.replace("Legal Name:", "").strip()
-            elif line.startswith("Phone:"):
-                phone = line.replace("Phone:", "").strip()
-            elif line.startswith("Physical Address:"):
-                address = line.replace("Physical Address:", "").strip()
+        dot_info = dot.text
+        company_name = dot.fields["legal_name"]
+        phone = dot.fields["phone"]
 
         if not company_name:
-            return "Error: Could not parse company name from DOT data"
+            return "Error: FMCSA record has no company name"
 
-        # 3. Check NowCerts for existing customer
-        nowcerts_check = self.nowcerts.search_by_dot(dot_number)
-        existing_customer = "No insured found" not in nowcerts_check
+        existing_customer = nowcerts.found
 
         # 4. Create lead in Close
         prospect_notes = f"DOT Lookup:\n{dot_info}"
@@ -175,20 +283,17 @@ class WorkflowTools(Toolkit):
             dot_number=dot_number,
             notes=prospect_notes,
         )
-
-        output.append("FMCSA INFO:")
-        output.append(dot_info)
-        output.append("")
-
-        if existing_customer:
-            output.append("NOWCERTS STATUS:")
-            output.append("** EXISTING CUSTOMER - Has policies **")
-            output.append("")
-
-        output.append("CLOSE CRM:")
-        output.append(create_result)
-
-        return "\n".join(output)
+        # A cached snapshot would still say "new prospect"
+        self.invalidate(dot_number)
+
+        return _NEW_PROSPECT_TEMPLATE.format_map({
+            "dot_number": dot_number,
+            "dot_info": dot_info,
+            "nowcerts_block": (
+                "NOWCERTS STATUS:\n** EXISTING CUSTOMER - Has policies **\n\n" if existing_customer else ""
+            ),
+            "create_result": create_result,
+        })
 
     @observe_tool
     def renewal_check(self, days_out: int = 30) -> str:
@@ -206,20 +311,51 @@ class WorkflowTools(Toolkit):
         """
         if days_out < 1:
             days_out = 30
-        if days_out > 90:
-            days_out = 90
+        days_out = min(days_out, 90)
 
         output = [f"=== RENEWAL CHECK: Next {days_out} Days ===", ""]
 
         # Get expiring policies
-        expiring = self.nowcerts.get_expiring_policies(days_out)
-
-        if "No policies expiring" in expiring:
+        key = f"expiring:{days_out}"
+        expiring = self._cache_get(key)
+        fresh = expiring is None
+        if fresh:
+            expiring = self.nowcerts.get_expiring_policies_raw(days_out)
+            if not expiring.error:
+                self._cache_put(key, expiring, _EXPIRING_TTL)
+
+        if expiring.status == "missing":
             output.append("No policies expiring in this timeframe.")
             return "\n".join(output)
 
-        output.append(expiring)
+        output.append(expiring.text)
         output.append("")
+
+        # Look up every carrier's Close status now (concurrently) rather
+        # than leaving one carrier_snapshot call per carrier to the user
+        dots = list(dict.fromkeys(
+            match.group(1)
+            for policy in expiring.rows
+            if (match := _DOT_PATTERN.search(policy.get("insuredName") or ""))
+        ))
+        if dots:
+            leads = run_parallel(*(
+                lambda dot=dot: self._lookup_close(dot) for dot in dots
+            ))
+            output.append("--- CLOSE CRM ---")
+            for dot, lead in zip(dots, leads):
+                output.append(f"DOT {dot}: {_close_status(lead)}")
+            output.append("")
+
+            # The user usually asks for a snapshot of some of these next;
+            # build them now so that follow-up is a cache hit. Only for a
+            # freshly fetched list (a repeat within _EXPIRING_TTL, e.g. a
+            # dashboard poll, already did this) and only snapshots that
+            # aren't cached yet.
+            if fresh:
+                cold = [dot for dot in dots if self._cache_get(f"snap:{dot}") is None]
+                run_in_background(*(lambda dot=dot: self._snapshot(dot) for dot in cold))
+
         output.append("Use carrier_snapshot(dot) for full details on any carrier.")
 
         return "\n".join(output)
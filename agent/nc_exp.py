@@ -0,0 +1,9 @@
+import stubs, httpx, datetime as dt
+from app.tools import nowcerts as nc
+d = (dt.datetime.now() + dt.timedelta(days=5)).strftime("%Y-%m-%dT00:00:00")
+def handler(req):
+    if req.url.params.get("$count"): return httpx.Response(200, json={"@odata.count": 2, "value": []})
+    return httpx.Response(200, json={"value": [{"policyNumber": "P1", "insuredName": "Acme DOT 1234567", "expirationDate": d}, {"policyNumber": "P2", "insuredName": "Old", "expirationDate": "2001-01-01T00:00:00"}]})
+t = nc.NowCertsTools(access_token="tok")
+t._api_client = httpx.Client(base_url=t.base_url, transport=httpx.MockTransport(handler))
+r = t.get_expiring_policies_raw(30); print(r.status, [p["policyNumber"] for p in r.rows]); print(t.get_expiring_policies(30))
@@ -2,17 +2,47 @@
 Pytest configuration for RMS Agent tests.
 """
 
+import atexit
 import os
+import shutil
 import sys
+import tempfile
+
 import pytest
 from dotenv import load_dotenv
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load environment variables
+# Load environment variables - once, before any test module is imported.
+# Values already exported (e.g. by CI) take precedence over .env.
 load_dotenv()
 
+# Notes written by tests go to a throwaway tree (one per process, so one per
+# xdist worker), never to the agent's real memory: RMS_NOTES_DIR from .env or
+# the shell is overridden, since the memory tests wipe the tree.
+# RMS_TEST_NOTES_DIR keeps test notes somewhere inspectable instead (split
+# per worker so workers can't wipe each other's files). Has to happen before
+# the agent builds its NotesTools.
+_notes_root = os.getenv("RMS_TEST_NOTES_DIR")
+if _notes_root:
+    _xdist_worker = os.getenv("PYTEST_XDIST_WORKER")
+    if _xdist_worker:
+        _notes_root = os.path.join(_notes_root, _xdist_worker)
+else:
+    _notes_root = tempfile.mkdtemp(prefix="rms-notes-")
+    atexit.register(shutil.rmtree, _notes_root, ignore_errors=True)
+os.environ["RMS_NOTES_DIR"] = _notes_root
+
+# Likewise a fresh FMCSA response cache per process: cached lookups skip the
+# network, so a shared one would change which requests a replayed scenario
+# makes depending on earlier runs.
+_fmcsa_cache_dir = tempfile.mkdtemp(prefix="rms-fmcsa-")
+atexit.register(shutil.rmtree, _fmcsa_cache_dir, ignore_errors=True)
+os.environ["FMCSA_CACHE_PATH"] = os.path.join(_fmcsa_cache_dir, "fmcsa.sqlite3")
+
+REQUIRED_ENV_VARS = ("ANTHROPIC_API_KEY",)
+
 
 def pytest_configure(config):
     """Configure pytest markers."""
@@ -21,12 +51,31 @@ def pytest_configure(config):
     )
 
 
+def _missing_env_vars() -> tuple[str, ...]:
+    """Required environment variables that are not set."""
+    return tuple(var for var in REQUIRED_ENV_VARS if not os.getenv(var))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def notes_tree():
+    """
+    Create the test notes tree up front.
+
+    The notes tools then find every directory in place and never fall back
+    to creating one while a test is writing.
+    """
+    from app.tools.notes import _NOTES_SUBDIRS, _default_notes_dir
+
+    notes_dir = _default_notes_dir()
+    for subdir in _NOTES_SUBDIRS:
+        (notes_dir / subdir).mkdir(parents=True, exist_ok=True)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def verify_environment():
     """Verify required environment variables are set."""
-    required_vars = ["ANTHROPIC_API_KEY"]
-
-    missing = [var for var in required_vars if not os.getenv(var)]
+    missing = _missing_env_vars()
 
     if missing:
         pytest.skip(f"Missing required environment variables: {', '.join(missing)}")
+
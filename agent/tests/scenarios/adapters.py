@@ -0,0 +1,50 @@
+"""
+Shared Scenario adapter for RMS Agent tests.
+"""
+
+import asyncio
+
+import scenario
+
+from app.agent import get_agent
+
+# Model used by Scenario's user simulator
+SCENARIO_MODEL = "anthropic/claude-sonnet-4-20250514"
+# Judges grade short yes/no criteria; a small model is enough and much faster
+JUDGE_MODEL = "anthropic/claude-haiku-4-5-20251001"
+
+
+class RMSAgentAdapter(scenario.AgentAdapter):
+    """
+    Adapter to connect Scenario testing framework with our Agno-based agent.
+
+    Following Agno best practices: agent is created once and reused.
+    """
+
+    def __init__(self):
+        # Get the singleton agent instance (NEVER create agents in loops!)
+        self.agent = get_agent()
+
+    async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
+        """
+        Call the agent with the latest user message.
+
+        Args:
+            input: Contains messages and conversation state
+
+        Returns:
+            str: Agent's response
+        """
+        # Get the last user message
+        last_message = input.messages[-1]["content"] if input.messages else ""
+
+        # Run agent on a worker thread, as the server does: agent.run()
+        # blocks, and the whole session shares this event loop
+        response = await asyncio.to_thread(self.agent.run, last_message)
+        content = response.content
+        if isinstance(content, str):
+            return content
+        # Content blocks: their text, not the list's repr
+        if isinstance(content, list):
+            return "".join(getattr(block, "text", "") for block in content)
+        return str(content)
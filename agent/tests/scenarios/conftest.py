@@ -0,0 +1,175 @@
+"""
+Shared fixtures for RMS Agent scenario tests.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import pytest
+import scenario
+
+from tests.scenarios.adapters import RMSAgentAdapter, SCENARIO_MODEL
+
+# Where Scenario's LLM responses are kept when RMS_TEST_LLM_CACHE=1
+_LLM_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "scenario-llm"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def llm_response_cache():
+    """
+    Reuse the user simulator's and judge's LLM responses across runs.
+
+    Opt-in with RMS_TEST_LLM_CACHE=1: Scenario calls its models through
+    litellm, whose disk cache is keyed on the full request (model, messages,
+    criteria), so reruns over unchanged agent output skip those calls. The
+    agent under test is not cached. Leave it off to exercise a fresh model.
+    """
+    if os.getenv("RMS_TEST_LLM_CACHE") != "1":
+        yield
+        return
+
+    import litellm
+
+    litellm.cache = litellm.Cache(type="disk", disk_cache_dir=str(_LLM_CACHE_DIR))
+    yield
+    litellm.cache = None
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Replay agent scenarios from cassettes (cassettes/<module>/ next to each test).
+
+    Recording is opt-in: by default a scenario replays its cassette if there
+    is one and otherwise calls the real services without writing anything.
+    --record-mode=once records the missing cassettes, --record-mode=rewrite
+    re-records them. Cassettes hold customer data, so they stay local
+    (gitignored). Scenarios marked live, and browser integration tests
+    whose page state can't be replayed, always use the real services; so
+    does everything under --disable-recording.
+    """
+    try:
+        from pytest_recording.plugin import get_default_cassette_name
+    except ImportError:
+        return
+
+    recording = config.getoption("--record-mode", default=None) not in (None, "none")
+    for item in items:
+        if not item.get_closest_marker("agent_test"):
+            continue
+        if item.get_closest_marker("live") or item.get_closest_marker("integration"):
+            continue
+        module = Path(str(item.fspath))
+        cassette = module.parent / "cassettes" / module.stem / f"{get_default_cassette_name(item.cls, item.name)}.yaml"
+        if recording or cassette.exists():
+            item.add_marker(pytest.mark.vcr)
+
+
+# ISO dates and timestamps in query strings, e.g. the expiring-policies window
+_QUERY_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:T[\d:.]+Z?)?")
+
+
+def _undated_query(request) -> list[tuple[str, str]]:
+    return [(key, _QUERY_DATE.sub("<date>", value)) for key, value in request.query]
+
+
+def _query_without_dates(r1, r2) -> None:
+    """VCR matcher: query strings equal once their dates are masked."""
+    assert _undated_query(r1) == _undated_query(r2), f"{r1.query} != {r2.query}"
+
+
+# Hosts whose request bodies are the conversation itself: the agent's,
+# simulator's and judge's prompts, including tool results
+_LLM_HOSTS = frozenset({"api.anthropic.com"})
+
+# Timestamps in LLM request bodies (notes entries, policy dates) and the
+# day counts derived from them
+_BODY_TIMESTAMP = re.compile(rb"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?Z?)?|\(\d+ days\)")
+
+
+def _masked_body(request) -> bytes:
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    return _BODY_TIMESTAMP.sub(b"<date>", body)
+
+
+def _llm_body(r1, r2) -> None:
+    """
+    VCR matcher: LLM request bodies equal once timestamps are masked.
+
+    CRM and FMCSA requests aren't compared here, so repeats of one endpoint
+    replay in recorded order.
+    """
+    if r1.host in _LLM_HOSTS:
+        assert _masked_body(r1) == _masked_body(r2), f"{r1.method} {r1.uri} body differs from the recording"
+
+
+def pytest_recording_configure(config, vcr):
+    """Register the cassette matchers used by vcr_config."""
+    vcr.register_matcher("query_without_dates", _query_without_dates)
+    vcr.register_matcher("llm_body", _llm_body)
+
+
+def _scrub_tokens(response: dict) -> dict:
+    """Replace OAuth tokens in recorded responses; replays never check them."""
+    body = response["body"]["string"]
+    if isinstance(body, bytes) and b'"access_token"' in body:
+        data = json.loads(body)
+        for key in ("access_token", "refresh_token"):
+            if key in data:
+                data[key] = "REDACTED"
+        response["body"]["string"] = json.dumps(data).encode()
+    return response
+
+
+@pytest.fixture(scope="module")
+def vcr_config():
+    """
+    Cassette settings for replayed scenarios.
+
+    Credentials are stripped before anything is written. Requests match on
+    method, URL and query, with dates in the query masked. LLM requests
+    also match on their body (timestamps masked), so a changed prompt, tool
+    output or judge input fails to replay instead of reusing a stale
+    verdict; re-record with --record-mode=rewrite. Other bodies aren't
+    compared.
+    """
+    return {
+        "filter_headers": ["authorization", "x-api-key", "cookie"],
+        "filter_query_parameters": ["webKey"],
+        "filter_post_data_parameters": ["username", "password", "refresh_token"],
+        "before_record_response": _scrub_tokens,
+        # Tracing exports aren't part of the conversation
+        "ignore_hosts": ["app.langwatch.ai"],
+        "match_on": ["method", "scheme", "host", "port", "path", "query_without_dates", "llm_body"],
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _configure_scenario():
+    """Default Scenario agents (the user simulator) to SCENARIO_MODEL, once per session."""
+    scenario.configure(default_model=SCENARIO_MODEL)
+
+
+@pytest.fixture(scope="session")
+def user_simulator(_configure_scenario):
+    """
+    One user simulator for every scenario.
+
+    It keeps no state between runs; the conversation lives in each run's
+    state. Built after configuration, since it reads the default model.
+    """
+    return scenario.UserSimulatorAgent()
+
+
+@pytest.fixture(scope="session")
+def rms_adapter():
+    """
+    Build the RMS agent adapter once per session.
+
+    The adapter only wraps the get_agent() singleton, so every scenario can
+    share it.
+    """
+    return RMSAgentAdapter()
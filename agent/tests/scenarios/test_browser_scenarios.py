@@ -10,39 +10,31 @@ only when the browser extension environment is available.
 
 import pytest
 import scenario
-from dotenv import load_dotenv
 
-# Load environment variables for tests
-load_dotenv()
-
-from app.agent import get_agent
-
-# Configure Scenario to use Anthropic
-scenario.configure(
-    default_model="anthropic/claude-sonnet-4-20250514",
-)
-
-
-class RMSAgentAdapter(scenario.AgentAdapter):
-    """Adapter for RMS agent."""
-
-    def __init__(self):
-        self.agent = get_agent()
-
-    async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        last_message = input.messages[-1]["content"] if input.messages else ""
-        response = self.agent.run(last_message)
-        return str(response.content)
+from tests.scenarios.adapters import JUDGE_MODEL
 
 
 # ============================================================================
 # TEST 1: Navigate to URL
 # ============================================================================
 
+NAVIGATE_TO_URL_CRITERIA = [
+    "Agent attempts to navigate to the URL",
+    "Agent reports navigation result (success or failure)",
+    "Agent provides appropriate feedback about the action",
+]
+
+NAVIGATE_TO_URL_SCRIPT = [
+    scenario.user("Navigate to google.com"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_navigate_to_url():
+async def test_navigate_to_url(rms_adapter, user_simulator):
     """
     Test that agent can navigate to a URL.
 
@@ -59,21 +51,14 @@ async def test_navigate_to_url():
             Agent should attempt navigation and report result.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent attempts to navigate to the URL",
-                    "Agent reports navigation result (success or failure)",
-                    "Agent provides appropriate feedback about the action",
-                ]
+                model=JUDGE_MODEL,
+                criteria=NAVIGATE_TO_URL_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Navigate to google.com"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=NAVIGATE_TO_URL_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -83,10 +68,23 @@ async def test_navigate_to_url():
 # TEST 2: Get Current Page State
 # ============================================================================
 
+GET_CURRENT_PAGE_CRITERIA = [
+    "Agent attempts to get current page information",
+    "Agent reports page title/URL OR reports extension not connected",
+    "Agent provides useful feedback about the browser state",
+]
+
+GET_CURRENT_PAGE_SCRIPT = [
+    scenario.user("What page is currently open in the browser?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_get_current_page():
+async def test_get_current_page(rms_adapter, user_simulator):
     """
     Test that agent can retrieve current page information.
 
@@ -103,21 +101,14 @@ async def test_get_current_page():
             Agent should check and report the current page state.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent attempts to get current page information",
-                    "Agent reports page title/URL OR reports extension not connected",
-                    "Agent provides useful feedback about the browser state",
-                ]
+                model=JUDGE_MODEL,
+                criteria=GET_CURRENT_PAGE_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("What page is currently open in the browser?"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=GET_CURRENT_PAGE_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -127,10 +118,23 @@ async def test_get_current_page():
 # TEST 3: Fill Form Field
 # ============================================================================
 
+FILL_FORM_FIELD_CRITERIA = [
+    "Agent attempts to fill the form field",
+    "Agent reports result (success, failure, or extension not connected)",
+    "Agent handles the request appropriately",
+]
+
+FILL_FORM_FIELD_SCRIPT = [
+    scenario.user("Fill the email field with test@example.com"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_fill_form_field():
+async def test_fill_form_field(rms_adapter, user_simulator):
     """
     Test that agent can fill form fields.
 
@@ -147,21 +151,14 @@ async def test_fill_form_field():
             Agent should attempt the fill and report result.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent attempts to fill the form field",
-                    "Agent reports result (success, failure, or extension not connected)",
-                    "Agent handles the request appropriately",
-                ]
+                model=JUDGE_MODEL,
+                criteria=FILL_FORM_FIELD_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Fill the email field with test@example.com"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=FILL_FORM_FIELD_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -171,9 +168,23 @@ async def test_fill_form_field():
 # TEST 4: Browser Tool Graceful Failure (No Extension)
 # ============================================================================
 
+BROWSER_GRACEFUL_FAILURE_CRITERIA = [
+    "Agent attempts the browser action",
+    "Agent reports an error or timeout if extension not connected",
+    "Agent does NOT hang or crash",
+    "Agent provides helpful feedback about what went wrong",
+]
+
+BROWSER_GRACEFUL_FAILURE_SCRIPT = [
+    scenario.user("Take a screenshot of the current tab"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_browser_graceful_failure():
+async def test_browser_graceful_failure(rms_adapter, user_simulator):
     """
     Test that agent handles missing browser extension gracefully.
 
@@ -191,22 +202,14 @@ async def test_browser_graceful_failure():
             Agent should handle gracefully and report the issue.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent attempts the browser action",
-                    "Agent reports an error or timeout if extension not connected",
-                    "Agent does NOT hang or crash",
-                    "Agent provides helpful feedback about what went wrong",
-                ]
+                model=JUDGE_MODEL,
+                criteria=BROWSER_GRACEFUL_FAILURE_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Take a screenshot of the current tab"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=BROWSER_GRACEFUL_FAILURE_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -13,30 +13,9 @@ For CI, these should be marked as integration tests.
 
 import pytest
 import scenario
-from dotenv import load_dotenv
 
-# Load environment variables for tests
-load_dotenv()
-
-from app.agent import get_agent
 from app.carriers.browser_agent import _build_task_prompt
-
-# Configure Scenario to use Anthropic
-scenario.configure(
-    default_model="anthropic/claude-sonnet-4-20250514",
-)
-
-
-class RMSAgentAdapter(scenario.AgentAdapter):
-    """Adapter for RMS agent."""
-
-    def __init__(self):
-        self.agent = get_agent()
-
-    async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        last_message = input.messages[-1]["content"] if input.messages else ""
-        response = self.agent.run(last_message)
-        return str(response.content)
+from tests.scenarios.adapters import JUDGE_MODEL
 
 
 # ============================================================================
@@ -104,11 +83,24 @@ def test_quote_prompt_with_minimal_data():
 # TEST 2: Start Progressive Quote (Integration)
 # ============================================================================
 
+START_PROGRESSIVE_QUOTE_CRITERIA = [
+    "Agent understands the request to start a quote",
+    "Agent indicates it will use browser automation",
+    "Agent provides feedback about the process starting",
+]
+
+START_PROGRESSIVE_QUOTE_SCRIPT = [
+    scenario.user("Start a Progressive quote for ABC Trucking, DOT 1234567, in Texas"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.integration
 @pytest.mark.slow
 @pytest.mark.asyncio
-async def test_start_progressive_quote():
+async def test_start_progressive_quote(rms_adapter, user_simulator):
     """
     Integration test: Agent initiates Progressive quote.
 
@@ -127,21 +119,14 @@ async def test_start_progressive_quote():
             Agent should initiate browser automation.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent understands the request to start a quote",
-                    "Agent indicates it will use browser automation",
-                    "Agent provides feedback about the process starting",
-                ]
+                model=JUDGE_MODEL,
+                criteria=START_PROGRESSIVE_QUOTE_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Start a Progressive quote for ABC Trucking, DOT 1234567, in Texas"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=START_PROGRESSIVE_QUOTE_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -9,38 +9,30 @@ Tests real API interactions:
 
 import pytest
 import scenario
-from dotenv import load_dotenv
 
-# Load environment variables for tests
-load_dotenv()
-
-from app.agent import get_agent
-
-# Configure Scenario to use Anthropic
-scenario.configure(
-    default_model="anthropic/claude-sonnet-4-20250514",
-)
-
-
-class RMSAgentAdapter(scenario.AgentAdapter):
-    """Adapter for RMS agent."""
-
-    def __init__(self):
-        self.agent = get_agent()
-
-    async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        last_message = input.messages[-1]["content"] if input.messages else ""
-        response = self.agent.run(last_message)
-        return str(response.content)
+from tests.scenarios.adapters import JUDGE_MODEL
 
 
 # ============================================================================
 # TEST 1: Search Insured by Name
 # ============================================================================
 
+SEARCH_INSURED_BY_NAME_CRITERIA = [
+    "Agent searches NowCerts for the insured",
+    "Agent reports search results or indicates no matches found",
+    "If results found, includes basic info like name and ID",
+]
+
+SEARCH_INSURED_BY_NAME_SCRIPT = [
+    scenario.user("Search NowCerts for LDJ"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_search_insured_by_name():
+async def test_search_insured_by_name(rms_adapter, user_simulator):
     """
     Test searching for an insured by name in NowCerts.
 
@@ -56,21 +48,14 @@ async def test_search_insured_by_name():
             Agent should search and return results or indicate nothing found.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent searches NowCerts for the insured",
-                    "Agent reports search results or indicates no matches found",
-                    "If results found, includes basic info like name and ID",
-                ]
+                model=JUDGE_MODEL,
+                criteria=SEARCH_INSURED_BY_NAME_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Search NowCerts for LDJ"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=SEARCH_INSURED_BY_NAME_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -80,9 +65,22 @@ async def test_search_insured_by_name():
 # TEST 2: Search Insured - Not Found
 # ============================================================================
 
+SEARCH_INSURED_NOT_FOUND_CRITERIA = [
+    "Agent attempts to search NowCerts",
+    "Agent reports no matching results were found",
+    "Agent does NOT make up or hallucinate insured data",
+]
+
+SEARCH_INSURED_NOT_FOUND_SCRIPT = [
+    scenario.user("Search NowCerts for XYZNONEXISTENT99999"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_search_insured_not_found():
+async def test_search_insured_not_found(rms_adapter, user_simulator):
     """
     Test graceful handling when no insured is found.
 
@@ -98,21 +96,14 @@ async def test_search_insured_not_found():
             Agent should report no results without hallucinating data.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent attempts to search NowCerts",
-                    "Agent reports no matching results were found",
-                    "Agent does NOT make up or hallucinate insured data",
-                ]
+                model=JUDGE_MODEL,
+                criteria=SEARCH_INSURED_NOT_FOUND_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Search NowCerts for XYZNONEXISTENT99999"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=SEARCH_INSURED_NOT_FOUND_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -122,9 +113,22 @@ async def test_search_insured_not_found():
 # TEST 3: Get Expiring Policies
 # ============================================================================
 
+GET_EXPIRING_POLICIES_CRITERIA = [
+    "Agent checks NowCerts for expiring policies",
+    "Agent provides a list with dates OR indicates none found",
+    "Response helps with renewal planning",
+]
+
+GET_EXPIRING_POLICIES_SCRIPT = [
+    scenario.user("What policies are expiring in the next 30 days?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_get_expiring_policies():
+async def test_get_expiring_policies(rms_adapter, user_simulator):
     """
     Test the expiring policies workflow for renewal pipeline.
 
@@ -140,21 +144,14 @@ async def test_get_expiring_policies():
             Agent should check NowCerts and provide renewal pipeline info.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent checks NowCerts for expiring policies",
-                    "Agent provides a list with dates OR indicates none found",
-                    "Response helps with renewal planning",
-                ]
+                model=JUDGE_MODEL,
+                criteria=GET_EXPIRING_POLICIES_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("What policies are expiring in the next 30 days?"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=GET_EXPIRING_POLICIES_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -11,55 +11,30 @@ Tests multi-turn conversations and tool usage following LangWatch best practices
 import os
 import pytest
 import scenario
-from dotenv import load_dotenv
 
-# Load environment variables for tests
-load_dotenv()
-
-from app.agent import get_agent
-
-# Configure Scenario to use Anthropic
-scenario.configure(
-    default_model="anthropic/claude-sonnet-4-20250514",
-)
-
-
-class RMSAgentAdapter(scenario.AgentAdapter):
-    """
-    Adapter to connect Scenario testing framework with our Agno-based agent.
-
-    Following Agno best practices: agent is created once and reused.
-    """
-
-    def __init__(self):
-        # Get the singleton agent instance (NEVER create agents in loops!)
-        self.agent = get_agent()
-
-    async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        """
-        Call the agent with the latest user message.
-
-        Args:
-            input: Contains messages and conversation state
-
-        Returns:
-            str: Agent's response
-        """
-        # Get the last user message
-        last_message = input.messages[-1]["content"] if input.messages else ""
-
-        # Run agent
-        response = self.agent.run(last_message)
-        return str(response.content)
+from tests.scenarios.adapters import JUDGE_MODEL
 
 
 # ============================================================================
 # TEST 1: DOT Number Lookup
 # ============================================================================
 
+DOT_NUMBER_LOOKUP_CRITERIA = [
+    "Agent provides carrier name and operating status",
+    "Agent includes relevant information like power units or MC number",
+    "Response is professional and helpful",
+]
+
+DOT_NUMBER_LOOKUP_SCRIPT = [
+    scenario.user("Look up DOT 1234567 for me"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_dot_number_lookup():
+async def test_dot_number_lookup(rms_adapter, user_simulator):
     """
     Test that agent can lookup DOT numbers and provide relevant information.
 
@@ -76,21 +51,14 @@ async def test_dot_number_lookup():
             the carrier information including company name and status.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent provides carrier name and operating status",
-                    "Agent includes relevant information like power units or MC number",
-                    "Response is professional and helpful",
-                ]
+                model=JUDGE_MODEL,
+                criteria=DOT_NUMBER_LOOKUP_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Look up DOT 1234567 for me"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=DOT_NUMBER_LOOKUP_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -100,9 +68,22 @@ async def test_dot_number_lookup():
 # TEST 2: Adding Notes to Lead
 # ============================================================================
 
+ADD_NOTE_TO_LEAD_CRITERIA = [
+    "Agent adds the note to the specified lead",
+    "Agent confirms the note was added successfully",
+    "Response includes the lead ID in confirmation",
+]
+
+ADD_NOTE_TO_LEAD_SCRIPT = [
+    scenario.user("Add a note to lead_abc123: Customer interested in cargo insurance, needs quote by Friday"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_add_note_to_lead():
+async def test_add_note_to_lead(rms_adapter, user_simulator):
     """
     Test that agent can add notes to leads in Close CRM.
 
@@ -117,21 +98,14 @@ async def test_add_note_to_lead():
             Agent should use the add_note_to_lead tool and confirm success.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent adds the note to the specified lead",
-                    "Agent confirms the note was added successfully",
-                    "Response includes the lead ID in confirmation",
-                ]
+                model=JUDGE_MODEL,
+                criteria=ADD_NOTE_TO_LEAD_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Add a note to lead_abc123: Customer interested in cargo insurance, needs quote by Friday"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=ADD_NOTE_TO_LEAD_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -141,9 +115,23 @@ async def test_add_note_to_lead():
 # TEST 3: Process Information - Broker Bond
 # ============================================================================
 
+BROKER_BOND_PROCESS_CRITERIA = [
+    "Agent explains what a broker bond (BMC-84) is",
+    "Agent mentions the $75,000 requirement",
+    "Agent provides our process steps",
+    "Information is accurate and helpful",
+]
+
+BROKER_BOND_PROCESS_SCRIPT = [
+    scenario.user("What's our process for getting a customer a broker bond?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_broker_bond_process():
+async def test_broker_bond_process(rms_adapter, user_simulator):
     """
     Test that agent can explain the broker bond process.
 
@@ -158,22 +146,14 @@ async def test_broker_bond_process():
             Agent should explain the BMC-84 requirements and our process.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent explains what a broker bond (BMC-84) is",
-                    "Agent mentions the $75,000 requirement",
-                    "Agent provides our process steps",
-                    "Information is accurate and helpful",
-                ]
+                model=JUDGE_MODEL,
+                criteria=BROKER_BOND_PROCESS_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("What's our process for getting a customer a broker bond?"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=BROKER_BOND_PROCESS_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -183,9 +163,25 @@ async def test_broker_bond_process():
 # TEST 4: Multi-Turn Workflow
 # ============================================================================
 
+MULTI_TURN_CUSTOMER_WORKFLOW_CRITERIA = [
+    "Agent successfully looks up the DOT number",
+    "Agent creates the lead with appropriate information",
+    "Agent maintains professional tone throughout",
+    "Agent confirms actions taken at each step",
+]
+
+MULTI_TURN_CUSTOMER_WORKFLOW_SCRIPT = [
+    scenario.user("Look up DOT 7654321"),
+    scenario.agent(),
+    scenario.user("Great, create a lead for them. Company is Acme Trucking, contact John at john@acme.com"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_multi_turn_customer_workflow():
+async def test_multi_turn_customer_workflow(rms_adapter, user_simulator):
     """
     Test a multi-turn conversation simulating a real customer workflow.
 
@@ -203,24 +199,14 @@ async def test_multi_turn_customer_workflow():
             The agent should handle both requests appropriately.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent successfully looks up the DOT number",
-                    "Agent creates the lead with appropriate information",
-                    "Agent maintains professional tone throughout",
-                    "Agent confirms actions taken at each step",
-                ]
+                model=JUDGE_MODEL,
+                criteria=MULTI_TURN_CUSTOMER_WORKFLOW_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("Look up DOT 7654321"),
-            scenario.agent(),
-            scenario.user("Great, create a lead for them. Company is Acme Trucking, contact John at john@acme.com"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=MULTI_TURN_CUSTOMER_WORKFLOW_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -230,9 +216,23 @@ async def test_multi_turn_customer_workflow():
 # TEST 5: Coverage Information
 # ============================================================================
 
+COVERAGE_INFORMATION_CRITERIA = [
+    "Agent explains what cargo insurance covers",
+    "Agent mentions typical coverage limits",
+    "Agent mentions any FMCSA requirements",
+    "Information is accurate for trucking industry",
+]
+
+COVERAGE_INFORMATION_SCRIPT = [
+    scenario.user("What does cargo insurance cover and what limits do trucking companies typically need?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
 @pytest.mark.agent_test
 @pytest.mark.asyncio
-async def test_coverage_information():
+async def test_coverage_information(rms_adapter, user_simulator):
     """
     Test that agent can explain insurance coverage types.
 
@@ -247,22 +247,14 @@ async def test_coverage_information():
             Agent should explain what cargo insurance covers and typical limits.
         """,
         agents=[
-            RMSAgentAdapter(),
-            scenario.UserSimulatorAgent(),
+            rms_adapter,
+            user_simulator,
             scenario.JudgeAgent(
-                criteria=[
-                    "Agent explains what cargo insurance covers",
-                    "Agent mentions typical coverage limits",
-                    "Agent mentions any FMCSA requirements",
-                    "Information is accurate for trucking industry",
-                ]
+                model=JUDGE_MODEL,
+                criteria=COVERAGE_INFORMATION_CRITERIA,
             ),
         ],
-        script=[
-            scenario.user("What does cargo insurance cover and what limits do trucking companies typically need?"),
-            scenario.agent(),
-            scenario.succeed(),
-        ],
+        script=COVERAGE_INFORMATION_SCRIPT,
     )
 
     assert result.success, f"Test failed: {result.reasoning}"
@@ -0,0 +1 @@
+"""V2 scenario tests for RMS Agent."""
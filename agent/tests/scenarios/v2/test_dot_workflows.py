@@ -0,0 +1,238 @@
+"""
+Scenario tests for RMS Insurance Agent v2: carrier questions by DOT.
+
+Tests the enhanced capabilities:
+- Cross-system workflows (carrier_snapshot, new_prospect)
+- Structured reasoning
+- Risk assessment heuristics
+"""
+
+import os
+
+import pytest
+import scenario
+
+from tests.scenarios.adapters import JUDGE_MODEL
+
+# V2 tests 1, 2 and 5 all ask about DOT 2865619; by default they run as one
+# combined session (test_dot_2865619_combined) that shares the lookups, and
+# their single-question cases of test_dot_workflow are skipped
+full_suite_only = pytest.mark.skipif(
+    os.getenv("RMS_FULL_SUITE") != "1",
+    reason="covered by test_dot_2865619_combined (set RMS_FULL_SUITE=1 to run)",
+)
+
+
+# ============================================================================
+# V2 TEST 1: Carrier Snapshot Workflow
+# ============================================================================
+
+CARRIER_SNAPSHOT_WORKFLOW_CRITERIA = [
+    "Agent provides FMCSA/DOT information (carrier name, status)",
+    "Agent checks or mentions Close CRM status",
+    "Agent checks or mentions NowCerts/policy status",
+    "Response provides a unified view across systems",
+]
+
+CARRIER_SNAPSHOT_WORKFLOW_SCRIPT = [
+    scenario.user("Give me a full carrier snapshot for DOT 2865619"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+CARRIER_SNAPSHOT_WORKFLOW_DESCRIPTION = """
+    User asks for a complete view of a carrier.
+    Agent should check DOT database, Close CRM, and NowCerts,
+    providing a unified view of the carrier.
+"""
+
+
+# ============================================================================
+# V2 TEST 2: Prospect Qualification with Risk Assessment
+# ============================================================================
+
+PROSPECT_QUALIFICATION_CRITERIA = [
+    "Agent looks up DOT and/or safety information",
+    "Agent considers safety metrics in assessment",
+    "Agent provides a clear recommendation (qualified, review, or decline)",
+    "Agent explains the reasoning behind the recommendation",
+]
+
+PROSPECT_QUALIFICATION_SCRIPT = [
+    scenario.user("Is DOT 2865619 a good prospect for us? Should we quote them?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+PROSPECT_QUALIFICATION_DESCRIPTION = """
+    User asks to qualify a carrier as a prospect.
+    Agent should look up their DOT and safety data,
+    apply risk assessment heuristics, and provide a
+    clear recommendation with reasoning.
+"""
+
+
+# ============================================================================
+# V2 TEST 5: Structured Reasoning
+# ============================================================================
+
+STRUCTURED_REASONING_CRITERIA = [
+    "Agent approaches the task systematically",
+    "Agent gathers relevant information",
+    "Agent synthesizes findings into a clear answer",
+    "Response shows logical reasoning process",
+]
+
+STRUCTURED_REASONING_SCRIPT = [
+    scenario.user("I need to call DOT 2865619 tomorrow. What should I know about them before the call?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+STRUCTURED_REASONING_DESCRIPTION = """
+    User asks a complex question requiring multiple steps.
+    Agent should demonstrate structured thinking.
+"""
+
+
+# ============================================================================
+# V2 TESTS 1, 2, 5: Combined DOT 2865619 Session
+# ============================================================================
+
+DOT_2865619_COMBINED_CRITERIA = [
+    *CARRIER_SNAPSHOT_WORKFLOW_CRITERIA,
+    *PROSPECT_QUALIFICATION_CRITERIA,
+    *STRUCTURED_REASONING_CRITERIA,
+]
+
+DOT_2865619_COMBINED_SCRIPT = [
+    scenario.user("Give me a full carrier snapshot for DOT 2865619"),
+    scenario.agent(),
+    scenario.user("Is DOT 2865619 a good prospect for us? Should we quote them?"),
+    scenario.agent(),
+    scenario.user("I need to call DOT 2865619 tomorrow. What should I know about them before the call?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
+@pytest.mark.agent_test
+@pytest.mark.asyncio
+async def test_dot_2865619_combined(rms_adapter, user_simulator):
+    """
+    Snapshot, qualification and call prep for one carrier in one session.
+
+    Runs the questions from V2 tests 1, 2 and 5 as consecutive turns, so the
+    carrier is looked up once and later turns build on it.
+    """
+    result = await scenario.run(
+        name="DOT 2865619 combined session",
+        description="""
+            User researches one carrier: asks for a full snapshot, then
+            whether they are a good prospect, then what to know before
+            calling them. Agent should give a unified cross-system view,
+            a reasoned recommendation, and a structured call brief.
+        """,
+        agents=[
+            rms_adapter,
+            user_simulator,
+            scenario.JudgeAgent(
+                model=JUDGE_MODEL,
+                criteria=DOT_2865619_COMBINED_CRITERIA,
+            ),
+        ],
+        script=DOT_2865619_COMBINED_SCRIPT,
+    )
+
+    assert result.success, f"Test failed: {result.reasoning}"
+
+
+# ============================================================================
+# V2 TEST 6: New Prospect Workflow
+# ============================================================================
+
+NEW_PROSPECT_WORKFLOW_CRITERIA = [
+    "Agent looks up the DOT information",
+    "Agent checks if lead already exists in CRM",
+    "Agent creates lead or explains why not",
+    "Agent provides summary of actions taken",
+]
+
+NEW_PROSPECT_WORKFLOW_SCRIPT = [
+    scenario.user("Create a new prospect from DOT 2865619"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+NEW_PROSPECT_WORKFLOW_DESCRIPTION = """
+    User wants to create a new prospect from a DOT number.
+    Agent should look up the carrier, check if they exist,
+    and create a lead if appropriate.
+"""
+
+
+# ============================================================================
+# V2 TESTS 1, 2, 5, 6: Single-Question DOT Workflows
+# ============================================================================
+
+@pytest.mark.agent_test
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name,description,criteria,script",
+    [
+        pytest.param(
+            "carrier snapshot workflow",
+            CARRIER_SNAPSHOT_WORKFLOW_DESCRIPTION,
+            CARRIER_SNAPSHOT_WORKFLOW_CRITERIA,
+            CARRIER_SNAPSHOT_WORKFLOW_SCRIPT,
+            id="carrier_snapshot",
+            marks=full_suite_only,
+        ),
+        pytest.param(
+            "prospect qualification",
+            PROSPECT_QUALIFICATION_DESCRIPTION,
+            PROSPECT_QUALIFICATION_CRITERIA,
+            PROSPECT_QUALIFICATION_SCRIPT,
+            id="prospect_qualification",
+            marks=full_suite_only,
+        ),
+        pytest.param(
+            "structured reasoning",
+            STRUCTURED_REASONING_DESCRIPTION,
+            STRUCTURED_REASONING_CRITERIA,
+            STRUCTURED_REASONING_SCRIPT,
+            id="structured_reasoning",
+            marks=full_suite_only,
+        ),
+        pytest.param(
+            "new prospect workflow",
+            NEW_PROSPECT_WORKFLOW_DESCRIPTION,
+            NEW_PROSPECT_WORKFLOW_CRITERIA,
+            NEW_PROSPECT_WORKFLOW_SCRIPT,
+            id="new_prospect",
+        ),
+    ],
+)
+async def test_dot_workflow(rms_adapter, user_simulator, name, description, criteria, script):
+    """
+    One question about a carrier, judged against that question's criteria.
+
+    Covers the cross-system workflows (carrier_snapshot, new_prospect), risk
+    assessment for prospect qualification, and structured reasoning for
+    call prep. Run a single case with e.g. test_dot_workflow[new_prospect].
+    """
+    result = await scenario.run(
+        name=name,
+        description=description,
+        agents=[
+            rms_adapter,
+            user_simulator,
+            scenario.JudgeAgent(
+                model=JUDGE_MODEL,
+                criteria=criteria,
+            ),
+        ],
+        script=script,
+    )
+
+    assert result.success, f"Test failed: {result.reasoning}"
@@ -0,0 +1,57 @@
+"""
+Scenario tests for RMS Insurance Agent v2: renewal pipeline.
+"""
+
+import pytest
+import scenario
+
+from tests.scenarios.adapters import JUDGE_MODEL
+
+
+# ============================================================================
+# V2 TEST 4: Expiring Policies Workflow
+# ============================================================================
+
+EXPIRING_POLICIES_CRITERIA = [
+    "Agent checks for expiring policies",
+    "Agent provides a list or indicates none found",
+    "If policies found, shows expiration dates",
+    "Response is actionable for renewal planning",
+]
+
+EXPIRING_POLICIES_SCRIPT = [
+    scenario.user("Show me policies expiring in the next 30 days"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
+@pytest.mark.agent_test
+@pytest.mark.asyncio
+async def test_expiring_policies(rms_adapter, user_simulator):
+    """
+    Test the expiring policies workflow.
+
+    Validates:
+    - Agent uses get_expiring_policies tool
+    - Agent provides list with dates
+    - Agent shows days remaining
+    """
+    result = await scenario.run(
+        name="expiring policies check",
+        description="""
+            User asks about policies expiring soon.
+            Agent should check NowCerts and provide a list.
+        """,
+        agents=[
+            rms_adapter,
+            user_simulator,
+            scenario.JudgeAgent(
+                model=JUDGE_MODEL,
+                criteria=EXPIRING_POLICIES_CRITERIA,
+            ),
+        ],
+        script=EXPIRING_POLICIES_SCRIPT,
+    )
+
+    assert result.success, f"Test failed: {result.reasoning}"
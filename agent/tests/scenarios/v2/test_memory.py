@@ -0,0 +1,124 @@
+"""
+Scenario tests for RMS Insurance Agent v2: memory/notes persistence.
+"""
+
+import shutil
+
+import pytest
+import scenario
+
+from app.tools.notes import _NOTES_SUBDIRS, _default_notes_dir
+from tests.scenarios.adapters import JUDGE_MODEL
+
+
+# ============================================================================
+# V2 TEST 3: Memory - Remember and Recall
+# ============================================================================
+
+@pytest.fixture
+def clean_notes_dir():
+    """Start from an empty notes tree (the session's, see tests/conftest.py)."""
+    notes_dir = _default_notes_dir()
+    if notes_dir.exists():
+        shutil.rmtree(notes_dir)
+    for subdir in _NOTES_SUBDIRS:
+        (notes_dir / subdir).mkdir(parents=True)
+
+    return notes_dir
+
+
+MEMORY_REMEMBER_CRITERIA = [
+    "Agent acknowledges the information to remember",
+    "Agent confirms the information was stored",
+    "Response indicates the memory was saved",
+]
+
+MEMORY_REMEMBER_SCRIPT = [
+    scenario.user("Remember that DOT 9999999 had a claim last month and we should follow up"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
+@pytest.mark.agent_test
+@pytest.mark.asyncio
+@pytest.mark.xdist_group("memory")
+async def test_memory_remember(rms_adapter, user_simulator, clean_notes_dir):
+    """
+    Test that agent can remember information.
+
+    Validates:
+    - Agent uses remember tool
+    - Agent confirms what was stored
+    """
+    result = await scenario.run(
+        name="memory remember",
+        description="""
+            User asks agent to remember something about a carrier.
+            Agent should store the information and confirm.
+        """,
+        agents=[
+            rms_adapter,
+            user_simulator,
+            scenario.JudgeAgent(
+                model=JUDGE_MODEL,
+                criteria=MEMORY_REMEMBER_CRITERIA,
+            ),
+        ],
+        script=MEMORY_REMEMBER_SCRIPT,
+    )
+
+    assert result.success, f"Test failed: {result.reasoning}"
+
+    # Verify the file was created
+    notes_file = clean_notes_dir / "carriers" / "9999999.md"
+    assert notes_file.exists(), "Notes file was not created"
+
+
+MEMORY_RECALL_CRITERIA = [
+    "Agent retrieves the stored information",
+    "Response mentions email contact preference",
+    "Agent provides the relevant context",
+]
+
+MEMORY_RECALL_SCRIPT = [
+    scenario.user("What do you know about DOT 8888888?"),
+    scenario.agent(),
+    scenario.succeed(),
+]
+
+
+@pytest.mark.agent_test
+@pytest.mark.asyncio
+@pytest.mark.xdist_group("memory")
+async def test_memory_recall(rms_adapter, user_simulator, clean_notes_dir):
+    """
+    Test that agent can recall previously stored information.
+
+    Validates:
+    - Agent remembers, then recalls
+    - Recalled information matches what was stored
+    """
+    # First, store something
+    await rms_adapter.call(scenario.AgentInput(
+        messages=[{"role": "user", "content": "Remember that DOT 8888888 prefers email contact only"}]
+    ))
+
+    # Now test recall
+    result = await scenario.run(
+        name="memory recall",
+        description="""
+            Agent should recall previously stored information.
+        """,
+        agents=[
+            rms_adapter,
+            user_simulator,
+            scenario.JudgeAgent(
+                model=JUDGE_MODEL,
+                criteria=MEMORY_RECALL_CRITERIA,
+            ),
+        ],
+        script=MEMORY_RECALL_SCRIPT,
+    )
+
+    assert result.success, f"Test failed: {result.reasoning}"